@@ -1,10 +1,17 @@
+import json
+import logging
+import os
 import re
+import threading
+import time
 import warnings
+from collections import deque
 from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
     Collection,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -25,7 +32,10 @@ from sqlalchemy.dialects.postgresql.base import (
     PGInspector,
     PGTypeCompiler,
 )
-from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+from sqlalchemy.dialects.postgresql.psycopg2 import (
+    PGDialect_psycopg2,
+    PGExecutionContext_psycopg2,
+)
 from sqlalchemy.engine.default import DefaultDialect
 from sqlalchemy.engine.interfaces import Dialect as RootDialect
 from sqlalchemy.engine.reflection import cache
@@ -35,9 +45,25 @@ from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import bindparam
 from sqlalchemy.sql.selectable import Select
 
-from ._supports import has_comment_support
+from ._bulk import can_bulk_insert, try_bulk_insert
+from ._pool import DuckDBSharedPool
+from ._prepared import PreparedStatementCache
+from ._profiling import RESET_PROFILING, read_profile, start_profiling, stop_profiling
+from ._reflection_cache import (
+    PersistentInfoCache,
+    catalog_fingerprint,
+    database_path,
+    multi_cache,
+)
+from ._result_cache import ResultCache, is_read, is_read_only, result_cache_key
+from ._supports import core_settings, has_comment_support, reserved_keywords
+from .arrow import fetch_arrow_table, fetch_record_batch
 from .config import apply_config, get_core_config
-from .datatypes import ISCHEMA_NAMES, register_extension_types
+from .copy import CopyFrom, CopyTo
+from .dataframes import insert_dataframe, read_sql
+from .datatypes import ISCHEMA_NAMES, parse_type, register_extension_types
+from .instrumentation import Instrumentation, QueryStats, rows_size
+from .readers import read_csv, read_json, read_parquet
 
 __version__ = "0.17.0"
 sqlalchemy_version = sqlalchemy.__version__
@@ -45,13 +71,19 @@ duckdb_version: str = duckdb.__version__
 supports_attach: bool = duckdb_version >= "0.7.0"
 supports_user_agent: bool = duckdb_version >= "0.9.2"
 
+if sqlalchemy_version >= "2.0.0":
+    from sqlalchemy.engine.interfaces import ExecuteStyle
+
 if TYPE_CHECKING:
+    import pandas
+    import pyarrow
     from sqlalchemy.base import Connection
-    from sqlalchemy.engine.interfaces import _IndexDict
     from sqlalchemy.sql.type_api import _ResultProcessor
 
 register_extension_types()
 
+logger = logging.getLogger(__name__)
+
 
 __all__ = [
     "Dialect",
@@ -59,7 +91,19 @@ __all__ = [
     "CursorWrapper",
     "DBAPI",
     "DuckDBEngineWarning",
+    "DuckDBSharedPool",
+    "Instrumentation",
+    "QueryStats",
+    "CopyFrom",
+    "CopyTo",
+    "fetch_arrow_table",
+    "fetch_record_batch",
     "insert",  # reexport of sqlalchemy.dialects.postgresql.insert
+    "insert_dataframe",
+    "read_csv",
+    "read_json",
+    "read_parquet",
+    "read_sql",
 ]
 
 
@@ -79,6 +123,27 @@ class DBAPI:
 
 
 class DuckDBInspector(PGInspector):
+    dialect: "Dialect"
+
+    @property
+    def info_cache(self) -> Dict[Any, Any]:
+        return self._info_cache
+
+    @info_cache.setter
+    def info_cache(self, info_cache: Dict[Any, Any]) -> None:
+        cache_dir = self.dialect.reflection_cache
+        database = database_path(self.engine.url)
+        if (
+            cache_dir is not None
+            and database is not None
+            and not isinstance(info_cache, PersistentInfoCache)
+        ):
+            bind, comments = self.bind, self.dialect.supports_comments
+            info_cache = PersistentInfoCache(
+                cache_dir, database, lambda: catalog_fingerprint(bind, comments)
+            )
+        self._info_cache = info_cache
+
     def get_check_constraints(
         self, table_name: str, schema: Optional[str] = None, **kw: Any
     ) -> List[Dict[str, Any]]:
@@ -90,16 +155,113 @@ class DuckDBInspector(PGInspector):
 
 class ConnectionWrapper:
     __c: duckdb.DuckDBPyConnection
+    __active_cursor: Optional["CursorWrapper"] = None
     notices: List[str]
     autocommit = None  # duckdb doesn't support setting autocommit
     closed = False
+    prepared_statements: Optional[PreparedStatementCache] = None
+    result_cache: Optional[ResultCache] = None
+    instrumentation: Optional[Instrumentation] = None
+    # profiling is still enabled, as the transaction was aborted
+    _profiling_pending = False
+    __in_transaction = False
 
-    def __init__(self, c: duckdb.DuckDBPyConnection) -> None:
+    def __init__(
+        self, c: duckdb.DuckDBPyConnection, prepared_statement_cache_size: int = 0
+    ) -> None:
         self.__c = c
         self.notices = list()
+        if prepared_statement_cache_size > 0:
+            self.prepared_statements = PreparedStatementCache(
+                prepared_statement_cache_size
+            )
+
+    def cursor(self, name: Optional[str] = None) -> "CursorWrapper":
+        """
+        :param name: passed by SQLAlchemy when ``stream_results`` is requested,
+            in which case a server side cursor is returned
+        """
+        if self.instrumentation is not None:
+            return InstrumentedCursorWrapper(
+                self.__c, self, self.instrumentation, server_side=name is not None
+            )
+        return CursorWrapper(self.__c, self, server_side=name is not None)
+
+    def duplicate(self) -> "ConnectionWrapper":
+        """
+        Open another connection to the same database instance
+        """
+        size = self.prepared_statements.size if self.prepared_statements else 0
+        duplicate = ConnectionWrapper(self.__c.cursor(), size)
+        if self.result_cache is not None:
+            duplicate._use_result_cache(self.result_cache)
+        duplicate.instrumentation = self.instrumentation
+        return duplicate
+
+    def _use_result_cache(self, result_cache: ResultCache) -> None:
+        self.result_cache = result_cache
+        # have results round trip through arrow with their original types
+        self.__c.execute("SET arrow_lossless_conversion = true")
+
+    def _leave_result_cache(self) -> None:
+        """
+        Stop using the result cache, once the connection has run a statement
+        that may change what its queries return, eg creating a temporary table
+        """
+        if self.result_cache is not None:
+            # the change may also be seen by other connections of the database
+            self.result_cache.clear()
+            self.result_cache = None
 
-    def cursor(self) -> "CursorWrapper":
-        return CursorWrapper(self.__c, self)
+    def _activate(self, cursor: Optional["CursorWrapper"]) -> None:
+        """
+        DuckDB keeps a single pending result per connection, which is discarded
+        by the next statement (including BEGIN/COMMIT/ROLLBACK). All cursors
+        share the connection's transaction, so instead of giving each its own
+        connection, the pending rows of the previously active cursor are
+        buffered before another statement runs.
+
+        Results still pending at the end of a transaction (``cursor`` is None)
+        are discarded rather than buffered, and a server side cursor's result
+        is never buffered, as it may be far larger than memory.
+        """
+        active = self.__active_cursor
+        if active is not None and active is not cursor:
+            if cursor is None:
+                active._discard()
+            elif active.server_side:
+                raise DBAPI.Error(
+                    "A server side cursor's result is still being read, close "
+                    "it before executing another statement on the connection"
+                )
+            else:
+                active._detach()
+        self.__active_cursor = cursor
+
+    def _release(self, cursor: "CursorWrapper") -> None:
+        if self.__active_cursor is cursor:
+            self.__active_cursor = None
+
+    def begin(self) -> None:
+        self._activate(None)
+        self.__c.begin()
+        self.__in_transaction = True
+
+    def commit(self) -> None:
+        # outside a transaction DuckDB's commit is a no-op that keeps the
+        # pending result, eg of a statement SQLAlchemy 1.x autocommits
+        if self.__in_transaction:
+            self._activate(None)
+        self.__c.commit()
+        self.__in_transaction = False
+
+    def rollback(self) -> None:
+        self._activate(None)
+        self.__in_transaction = False
+        self.__c.rollback()
+        if self._profiling_pending:
+            self.__c.execute(RESET_PROFILING)
+            self._profiling_pending = False
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self.__c, name)
@@ -109,15 +271,55 @@ class ConnectionWrapper:
         self.closed = True
 
 
+_REGISTER_COMMANDS = frozenset({"register", "register(?, ?)", "register($1, $2)"})
+_COMMAND_LENGTH = max(map(len, _REGISTER_COMMANDS | {"commit"}))
+
+
 class CursorWrapper:
+    """
+    DBAPI cursor over a DuckDB connection
+
+    Server side cursors run on the same connection, so they see the current
+    transaction. DuckDB already streams query results, so they read them with
+    bounded ``fetchmany`` calls rather than materializing the whole result.
+    """
+
     __c: duckdb.DuckDBPyConnection
     __connection_wrapper: "ConnectionWrapper"
+    # rows of a result that was displaced by a statement on another cursor
+    __rows: Optional[Deque[Tuple]] = None
+    __description: Optional[List[Tuple]] = None
+    # the cached result being read, if any
+    __table: Optional["pyarrow.Table"] = None
+    server_side: bool
+    arraysize: int = 1
+    rows_fetched: bool = False
+    # the unread result was discarded by the end of the transaction
+    __discarded: bool = False
 
     def __init__(
-        self, c: duckdb.DuckDBPyConnection, connection_wrapper: "ConnectionWrapper"
+        self,
+        c: duckdb.DuckDBPyConnection,
+        connection_wrapper: "ConnectionWrapper",
+        server_side: bool = False,
     ) -> None:
         self.__c = c
         self.__connection_wrapper = connection_wrapper
+        self.server_side = server_side
+
+    def _detach(self) -> None:
+        self.__description = self.__c.description
+        self.__rows = deque(self.__c.fetchall() if self.__description else ())
+
+    def _discard(self) -> None:
+        self.__description = self.__c.description
+        self.__rows = deque()
+        self.__discarded = True
+
+    def __activate(self) -> None:
+        self.__connection_wrapper._activate(self)
+        self.__rows = self.__description = self.__table = None
+        self.rows_fetched = self.__discarded = False
 
     def executemany(
         self,
@@ -125,7 +327,11 @@ class CursorWrapper:
         parameters: Optional[List[Dict]] = None,
         context: Optional[Any] = None,
     ) -> None:
-        self.__c.executemany(statement, list(parameters) if parameters else [])
+        self.__activate()
+        self.__connection_wrapper._leave_result_cache()
+        parameters = list(parameters) if parameters else []
+        if not try_bulk_insert(self.__c, statement, parameters):
+            self.__c.executemany(statement, parameters)
 
     def execute(
         self,
@@ -133,21 +339,28 @@ class CursorWrapper:
         parameters: Optional[Tuple] = None,
         context: Optional[Any] = None,
     ) -> None:
+        self.__activate()
+        # only short statements can be one of the commands, which spares
+        # lowering every (possibly very long) query
+        command = statement.lower() if len(statement) <= _COMMAND_LENGTH else None
+        if self.__connection_wrapper.result_cache is not None and not (
+            command == "commit" or is_read(statement)
+        ):
+            # including registering a view
+            self.__connection_wrapper._leave_result_cache()
         try:
-            if statement.lower() == "commit":  # this is largely for ipython-sql
+            if command == "commit":  # this is largely for ipython-sql
                 self.__c.commit()
-            elif statement.lower() in (
-                "register",
-                "register(?, ?)",
-                "register($1, $2)",
-            ):
+            elif command in _REGISTER_COMMANDS:
                 assert parameters and len(parameters) == 2, parameters
                 view_name, df = parameters
                 self.__c.register(view_name, df)
-            elif parameters is None:
-                self.__c.execute(statement)
+            elif context is not None and context.execution_options.get(
+                "duckdb_profile"
+            ):
+                self.__execute_profiled(statement, parameters, context)
             else:
-                self.__c.execute(statement, parameters)
+                self.__execute_cached(statement, parameters, context)
         except RuntimeError as e:
             if e.args[0].startswith("Not implemented Error"):
                 raise NotImplementedError(*e.args) from e
@@ -159,48 +372,327 @@ class CursorWrapper:
             else:
                 raise e
 
+    def __execute_cached(
+        self, statement: str, parameters: Optional[Tuple], context: Optional[Any]
+    ) -> None:
+        result_cache = self.__connection_wrapper.result_cache
+        key = None
+        if result_cache is not None and (
+            context is None
+            or context.execution_options.get("duckdb_result_cache", True)
+        ):
+            key = result_cache_key(statement, parameters)
+        if result_cache is None or key is None:
+            self.__execute(statement, parameters)
+            return
+
+        cached = result_cache.get(key)
+        if cached is None:
+            self.__execute(statement, parameters)
+            description = self.__c.description
+            if description is None:
+                return
+            cached = description, self.__c.fetch_arrow_table()
+            result_cache.put(key, *cached)
+
+        self.__connection_wrapper._release(self)
+        self.__description, self.__table = cached
+        self.__rows = deque(self.__c.from_arrow(self.__table).fetchall())
+
+    def __execute_profiled(
+        self, statement: str, parameters: Optional[Tuple], context: Any
+    ) -> None:
+        path = start_profiling(self.__c)
+        try:
+            self.__execute(statement, parameters)
+            # the profile is only written once the result has been read
+            self._detach()
+            self.__connection_wrapper._release(self)
+        finally:
+            if not stop_profiling(self.__c):
+                self.__connection_wrapper._profiling_pending = True
+            profile = read_profile(path)
+        context.duckdb_profile = profile
+        logger.info("Profile of %s: %s", statement, json.dumps(profile))
+
+    def __execute(self, statement: str, parameters: Optional[Tuple]) -> None:
+        prepared = self.__connection_wrapper.prepared_statements
+        if prepared is not None:
+            prepared.invalidate(self.__c, statement)
+            execute = prepared.execute_statement(self.__c, statement, parameters or ())
+            if execute is not None:
+                self.__c.execute(execute)
+                return
+        if parameters is None:
+            self.__c.execute(statement)
+        else:
+            self.__c.execute(statement, parameters)
+
     @property
     def connection(self) -> "Connection":
         return self.__connection_wrapper
 
+    @property
+    def description(self) -> Optional[List[Tuple]]:
+        if self.__rows is not None:
+            return self.__description
+        return self.__c.description
+
     def close(self) -> None:
-        pass  # closing cursors is not supported in duckdb
+        # the duckdb result is left for the next statement to discard
+        self.__connection_wrapper._release(self)
+        self.__rows = None
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self.__c, name)
 
+    def __check_discarded(self) -> None:
+        if self.__discarded:
+            raise DBAPI.Error(
+                "The result can't be fetched, as it was discarded when the "
+                "transaction ended before it had been read"
+            )
+
+    def fetchone(self) -> Optional[Tuple]:
+        self.__check_discarded()
+        self.rows_fetched = True
+        if self.__rows is not None:
+            return self.__rows.popleft() if self.__rows else None
+        return self.__c.fetchone()
+
     def fetchmany(self, size: Optional[int] = None) -> List:
+        self.__check_discarded()
+        self.rows_fetched = True
         if size is None:
-            return self.__c.fetchmany()
-        else:
-            return self.__c.fetchmany(size)
+            size = self.arraysize
+        if self.__rows is not None:
+            rows = self.__rows
+            return [rows.popleft() for _ in range(min(size, len(rows)))]
+        return self.__c.fetchmany(size)
+
+    def fetchall(self) -> List:
+        self.__check_discarded()
+        self.rows_fetched = True
+        if self.__rows is not None:
+            rows = list(self.__rows)
+            self.__rows.clear()
+            return rows
+        return self.__c.fetchall()
+
+    def __check_attached(self, release: bool = True) -> None:
+        self.__check_discarded()
+        if self.__rows is not None and self.__table is None:
+            raise NotImplementedError(
+                "Arrow or DataFrame results can't be fetched once another "
+                "statement has been executed on the connection"
+            )
+        if release:
+            # the duckdb result is handed over whole, leaving nothing to buffer
+            self.__connection_wrapper._release(self)
+
+    def fetch_arrow_table(self, rows_per_batch: int = 1_000_000) -> "pyarrow.Table":
+        self.__check_attached()
+        if self.__table is not None:
+            return self.__table
+        return self.__c.fetch_arrow_table(rows_per_batch)
+
+    def fetch_record_batch(
+        self, rows_per_batch: int = 1_000_000
+    ) -> "pyarrow.RecordBatchReader":
+        self.__check_attached()
+        if self.__table is not None:
+            return self.__table.to_reader(rows_per_batch)
+        return self.__c.fetch_record_batch(rows_per_batch)
+
+    def fetch_df(self) -> "pandas.DataFrame":
+        self.__check_attached()
+        if self.__table is not None:
+            return self.__c.from_arrow(self.__table).df()
+        return self.__c.fetchdf()
+
+    def fetch_df_chunk(self, vectors_per_chunk: int = 1) -> "pandas.DataFrame":
+        # the result stays with the cursor, to be buffered as rows if another
+        # statement is run before it is exhausted
+        self.__check_attached(release=False)
+        if self.__table is not None:
+            # a cached result is returned in one chunk
+            table, self.__table = self.__table, self.__table.slice(0, 0)
+            return self.__c.from_arrow(table).df()
+        return self.__c.fetch_df_chunk(vectors_per_chunk)
+
+
+class InstrumentedCursorWrapper(CursorWrapper):
+    """
+    ``CursorWrapper`` that reports each statement, and each fetch of its
+    results, to an ``Instrumentation``
+
+    Record batch readers are returned unmeasured, as they are read lazily.
+    """
+
+    statement: Optional[str] = None
+
+    def __init__(
+        self,
+        c: duckdb.DuckDBPyConnection,
+        connection_wrapper: "ConnectionWrapper",
+        instrumentation: Instrumentation,
+        server_side: bool = False,
+    ) -> None:
+        super().__init__(c, connection_wrapper, server_side)
+        self.instrumentation = instrumentation
+        # SQLAlchemy creates a cursor per statement, once it's compiled
+        self.created: Optional[float] = time.perf_counter()
+
+    def __executed(self, statement: str, started: float) -> None:
+        latency = started - self.created if self.created is not None else 0.0
+        self.created = None
+        self.statement = statement
+        self.instrumentation.on_execute(
+            statement, latency, time.perf_counter() - started
+        )
+
+    def __fetched(self, rows: int, nbytes: int, started: float) -> None:
+        if self.statement is not None:
+            self.instrumentation.on_fetch(
+                self.statement, rows, nbytes, time.perf_counter() - started
+            )
+
+    def execute(
+        self,
+        statement: str,
+        parameters: Optional[Tuple] = None,
+        context: Optional[Any] = None,
+    ) -> None:
+        started = time.perf_counter()
+        super().execute(statement, parameters, context)
+        self.__executed(statement, started)
+
+    def executemany(
+        self,
+        statement: str,
+        parameters: Optional[List[Dict]] = None,
+        context: Optional[Any] = None,
+    ) -> None:
+        started = time.perf_counter()
+        super().executemany(statement, parameters, context)
+        self.__executed(statement, started)
+
+    def fetchone(self) -> Optional[Tuple]:
+        started = time.perf_counter()
+        row = super().fetchone()
+        rows = [] if row is None else [row]
+        self.__fetched(len(rows), rows_size(rows), started)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List:
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self.__fetched(len(rows), rows_size(rows), started)
+        return rows
+
+    def fetchall(self) -> List:
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self.__fetched(len(rows), rows_size(rows), started)
+        return rows
+
+    def fetch_arrow_table(self, rows_per_batch: int = 1_000_000) -> "pyarrow.Table":
+        started = time.perf_counter()
+        table = super().fetch_arrow_table(rows_per_batch)
+        self.__fetched(table.num_rows, table.nbytes, started)
+        return table
+
+    def fetch_df(self) -> "pandas.DataFrame":
+        started = time.perf_counter()
+        frame = super().fetch_df()
+        self.__fetched(len(frame), int(frame.memory_usage().sum()), started)
+        return frame
+
+    def fetch_df_chunk(self, vectors_per_chunk: int = 1) -> "pandas.DataFrame":
+        started = time.perf_counter()
+        frame = super().fetch_df_chunk(vectors_per_chunk)
+        self.__fetched(len(frame), int(frame.memory_usage().sum()), started)
+        return frame
 
 
 class DuckDBEngineWarning(Warning):
     pass
 
 
-def index_warning() -> None:
-    warnings.warn(
-        "duckdb-engine doesn't yet support reflection on indices",
-        DuckDBEngineWarning,
-    )
+_INDEX_TOKEN_RE = re.compile(r""""(?:[^"]|"")*"|'(?:[^']|'')*'|[(),]|[^(),"']+""")
+_IDENTIFIER_RE = re.compile(r'^(?:\w+|"(?:[^"]|"")*")$')
+
+
+def parse_index_expressions(expressions: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Split the ``expressions`` column of ``duckdb_indexes()``, eg ``[a, "B c", (lower(d))]``,
+    into ``(column name or None, expression)`` pairs
+    """
+    return split_index_elements(_INDEX_TOKEN_RE.findall(expressions.strip()[1:-1]))
+
+
+def parse_index_sql(sql: str) -> Optional[List[Tuple[Optional[str], str]]]:
+    """
+    Like ``parse_index_expressions``, from the parenthesised element list of the
+    index's ``CREATE INDEX`` statement, for DuckDB versions that leave the
+    ``expressions`` column NULL
+    """
+    tokens: List[str] = []
+    depth = 0
+    for token in _INDEX_TOKEN_RE.findall(sql):
+        if token == ")":
+            depth -= 1
+            if depth == 0:
+                return split_index_elements(tokens)
+        if depth > 0:
+            tokens.append(token)
+        if token == "(":
+            depth += 1
+    return None
+
+
+def split_index_elements(tokens: List[str]) -> List[Tuple[Optional[str], str]]:
+    parts = [""]
+    depth = 0
+    for token in tokens:
+        if token == "," and depth == 0:
+            parts.append("")
+            continue
+        depth += {"(": 1, ")": -1}.get(token, 0)
+        parts[-1] += token
+
+    elements: List[Tuple[Optional[str], str]] = []
+    for part in parts:
+        element = part.strip()
+        if _IDENTIFIER_RE.match(element):
+            name = element[1:-1].replace('""', '"') if element[0] == '"' else element
+            elements.append((name, name))
+        else:
+            elements.append((None, unwrap_parentheses(element)))
+    return elements
+
+
+def unwrap_parentheses(expression: str) -> str:
+    """
+    ``expression`` without the parentheses enclosing all of it, which
+    DuckDB versions add a varying number of
+    """
+    while expression.startswith("(") and expression.endswith(")"):
+        tokens = _INDEX_TOKEN_RE.findall(expression)
+        depth = 0
+        for token in tokens[:-1]:
+            depth += {"(": 1, ")": -1}.get(token, 0)
+            if depth == 0:
+                # the opening parenthesis closes before the end
+                return expression
+        expression = expression[1:-1].strip()
+    return expression
 
 
 class DuckDBIdentifierPreparer(PGIdentifierPreparer):
-    def __init__(self, dialect: "Dialect", **kwargs: Any) -> None:
-        super().__init__(dialect, **kwargs)
-
-        self.reserved_words.update(
-            {
-                keyword_name
-                for (keyword_name,) in duckdb.cursor()
-                .execute(
-                    "select keyword_name from duckdb_keywords() where keyword_category == 'reserved'"
-                )
-                .fetchall()
-            }
-        )
+    @util.memoized_property
+    def reserved_words(self) -> Set[str]:  # type: ignore[override]
+        return PGIdentifierPreparer.reserved_words | set(reserved_keywords())
 
     def _separate(self, name: Optional[str]) -> Tuple[Optional[Any], Optional[str]]:
         """
@@ -243,16 +735,31 @@ class DuckDBNullType(sqltypes.NullType):
             return super().result_processor(dialect, coltype)
 
 
+class DuckDBExecutionContext(PGExecutionContext_psycopg2):
+    def pre_exec(self) -> None:
+        super().pre_exec()  # type: ignore[no-untyped-call]
+        # SQLAlchemy 2 renders executemany inserts as INSERT statements with a
+        # VALUES tuple per row. Those without RETURNING whose rows can be
+        # inserted as a single columnar batch go to executemany instead
+        if (
+            sqlalchemy_version >= "2.0.0"
+            and self.execute_style is ExecuteStyle.INSERTMANYVALUES
+            and not self.compiled.effective_returning  # type: ignore[union-attr]
+            and can_bulk_insert(self.statement, self.parameters)
+        ):
+            self.execute_style = ExecuteStyle.EXECUTEMANY
+
+
 class Dialect(PGDialect_psycopg2):
     name = "duckdb"
     driver = "duckdb_engine"
     _has_events = False
-    supports_statement_cache = False
-    supports_comments = has_comment_support()
+    supports_statement_cache = True
     supports_sane_rowcount = False
-    supports_server_side_cursors = False
+    supports_server_side_cursors = True
     div_is_floordiv = False  # TODO: tweak this to be based on DuckDB version
     inspector = DuckDBInspector
+    execution_ctx_cls = DuckDBExecutionContext
     colspecs = util.update_copy(
         PGDialect.colspecs,
         {
@@ -270,9 +777,20 @@ class Dialect(PGDialect_psycopg2):
     preparer = DuckDBIdentifierPreparer
     identifier_preparer: DuckDBIdentifierPreparer
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, reflection_cache: Optional[str] = None, **kwargs: Any) -> None:
+        """
+        :param reflection_cache: directory to persist reflection results in,
+            see ``PersistentInfoCache``
+        """
         kwargs["use_native_hstore"] = False
-        super().__init__(*args, **kwargs)
+        super().__init__(**kwargs)
+        self.reflection_cache = reflection_cache
+        self._result_caches: Dict[str, ResultCache] = {}
+        self._result_caches_lock = threading.Lock()
+
+    @util.memoized_property
+    def supports_comments(self) -> bool:  # type: ignore[override]
+        return has_comment_support()
 
     def type_descriptor(self, typeobj: Type[sqltypes.TypeEngine]) -> Any:  # type: ignore[override]
         res = super().type_descriptor(typeobj)
@@ -297,18 +815,56 @@ class Dialect(PGDialect_psycopg2):
             config["custom_user_agent"] = user_agent
 
         filesystems = cparams.pop("register_filesystems", [])
+        prepared_statement_cache_size = cparams.pop("prepared_statement_cache_size", 0)
+        result_cache_size = cparams.pop("result_cache_size", 0)
+        instrumentation = cparams.pop("instrumentation", None)
 
+        started = time.perf_counter()
         conn = duckdb.connect(*cargs, **cparams)
-
-        for extension in preload_extensions:
-            conn.execute(f"LOAD {extension}")
+        opened = time.perf_counter()
 
         for filesystem in filesystems:
             conn.register_filesystem(filesystem)
 
-        apply_config(self, conn, ext)
+        apply_config(self, conn, ext, preload_extensions)
+        configured = time.perf_counter()
+        logger.debug(
+            "Connected to %s in %.2fms (%.2fms opening, %.2fms configuring)",
+            cparams.get("database"),
+            (configured - started) * 1000,
+            (opened - started) * 1000,
+            (configured - opened) * 1000,
+        )
 
-        return ConnectionWrapper(conn)
+        wrapper = ConnectionWrapper(conn, prepared_statement_cache_size)
+        wrapper.instrumentation = instrumentation
+        if result_cache_size > 0:
+            result_cache = self._result_cache(cparams, result_cache_size)
+            if result_cache is not None:
+                wrapper._use_result_cache(result_cache)
+        return wrapper
+
+    def _result_cache(self, cparams: dict, size: int) -> Optional[ResultCache]:
+        """
+        The result cache shared by this engine's connections, which is only
+        used for read only database files
+        """
+        database = cparams.get("database") or ""
+        path = os.path.abspath(database.split("?", 1)[0])
+        if not is_read_only(cparams) or not os.path.isfile(path):
+            return None
+        if "arrow_lossless_conversion" not in core_settings():
+            # cached results would come back with other types, eg UUIDs as str
+            warnings.warn(
+                "result_cache_size is ignored, as this version of DuckDB can't "
+                "convert results to Arrow without losing their types",
+                DuckDBEngineWarning,
+            )
+            return None
+        with self._result_caches_lock:
+            if path not in self._result_caches:
+                self._result_caches[path] = ResultCache(path, size)
+            return self._result_caches[path]
 
     def on_connect(self) -> None:
         pass
@@ -343,13 +899,14 @@ class Dialect(PGDialect_psycopg2):
     def do_begin(self, connection: "Connection") -> None:
         connection.begin()
 
-    def get_view_names(
+    @cache  # type: ignore[call-arg]
+    def get_view_names(  # type: ignore[no-untyped-def]
         self,
-        connection: Any,
-        schema: Optional[Any] = None,
-        include: Optional[Any] = None,
-        **kw: Any,
-    ) -> Any:
+        connection: "Any",
+        schema: "Optional[Any]" = None,
+        include: "Optional[Any]" = None,
+        **kw: "Any",
+    ):
         s = """
             SELECT table_name
             FROM information_schema.tables
@@ -498,17 +1055,69 @@ class Dialect(PGDialect_psycopg2):
         except NoSuchTableError:
             return False
 
-    def get_indexes(
+    def _get_indexes_info(
+        self,
+        connection: "Connection",
+        schema: Optional[str],
+        filter_names: Optional[Collection[str]],
+    ) -> Dict[Tuple[Optional[str], str], List[Dict[str, Any]]]:
+        s = """
+            SELECT table_name, index_name, is_unique, expressions, sql
+            FROM duckdb_indexes()
+            WHERE NOT is_primary
+            """
+        sql, params = self._build_query_where(schema_name=schema)
+        s += sql
+        if schema is None:
+            s += (
+                "AND database_name = current_database()\n"
+                "AND schema_name = current_schema()\n"
+            )
+        binds = []
+        if filter_names:
+            s += "AND table_name IN :filter_names\n"
+            binds.append(bindparam("filter_names", list(filter_names), expanding=True))
+        s += "ORDER BY database_name, schema_name, table_name, index_name"
+        rs = connection.execute(text(s).bindparams(*binds), params)
+
+        indexes: Dict[Tuple[Optional[str], str], List[Dict[str, Any]]] = {}
+        for table_name, index_name, is_unique, expressions, index_sql in rs:
+            elements: Optional[List[Tuple[Optional[str], str]]]
+            if expressions is not None:
+                elements = parse_index_expressions(expressions)
+            else:
+                elements = parse_index_sql(index_sql or "")
+            if not elements:
+                warnings.warn(
+                    f"duckdb-engine couldn't reflect the columns of index {index_name}",
+                    DuckDBEngineWarning,
+                )
+                continue
+            index: Dict[str, Any] = {
+                "name": index_name,
+                "column_names": [name for name, _ in elements],
+                "unique": is_unique,
+                "include_columns": [],
+                "dialect_options": {},
+            }
+            if any(name is None for name, _ in elements):
+                index["expressions"] = [expression for _, expression in elements]
+            indexes.setdefault((schema, table_name), []).append(index)
+        return indexes
+
+    @cache  # type: ignore[call-arg]
+    def get_indexes(  # type: ignore[no-untyped-def]
         self,
         connection: "Connection",
         table_name: str,
-        schema: Optional[str] = None,
-        **kw: Any,
-    ) -> List["_IndexDict"]:
-        index_warning()
-        return []
+        schema: "Optional[str]" = None,
+        **kw: "Any",
+    ):
+        indexes = self._get_indexes_info(connection, schema, [table_name])
+        return indexes.get((schema, table_name), [])
 
     # the following methods are for SQLA2 compatibility
+    @multi_cache
     def get_multi_indexes(
         self,
         connection: "Connection",
@@ -516,8 +1125,37 @@ class Dialect(PGDialect_psycopg2):
         filter_names: Optional[Collection[str]] = None,
         **kw: Any,
     ) -> Iterable[Tuple]:
-        index_warning()
-        return []
+        return self._get_indexes_info(connection, schema, filter_names).items()
+
+    @multi_cache
+    def get_multi_pk_constraint(
+        self, connection: "Connection", *args: Any, **kw: Any
+    ) -> Iterable[Tuple]:
+        return super().get_multi_pk_constraint(connection, *args, **kw)
+
+    @multi_cache
+    def get_multi_foreign_keys(
+        self, connection: "Connection", *args: Any, **kw: Any
+    ) -> Iterable[Tuple]:
+        return super().get_multi_foreign_keys(connection, *args, **kw)
+
+    @multi_cache
+    def get_multi_unique_constraints(
+        self, connection: "Connection", *args: Any, **kw: Any
+    ) -> Iterable[Tuple]:
+        return super().get_multi_unique_constraints(connection, *args, **kw)
+
+    @multi_cache
+    def get_multi_check_constraints(
+        self, connection: "Connection", *args: Any, **kw: Any
+    ) -> Iterable[Tuple]:
+        return super().get_multi_check_constraints(connection, *args, **kw)
+
+    @multi_cache
+    def get_multi_table_comment(
+        self, connection: "Connection", *args: Any, **kw: Any
+    ) -> Iterable[Tuple]:
+        return super().get_multi_table_comment(connection, *args, **kw)
 
     def initialize(self, connection: "Connection") -> None:
         DefaultDialect.initialize(self, connection)
@@ -534,6 +1172,16 @@ class Dialect(PGDialect_psycopg2):
     def import_dbapi(cls: Type["Dialect"]) -> Type[DBAPI]:
         return cls.dbapi()
 
+    def do_execute(
+        self,
+        cursor: Any,
+        statement: Any,
+        parameters: Any,
+        context: Optional[Any] = None,
+    ) -> None:
+        # the context carries the duckdb_result_cache execution option
+        cursor.execute(statement, parameters, context)
+
     def do_executemany(
         self, cursor: Any, statement: Any, parameters: Any, context: Optional[Any] = ...
     ) -> None:
@@ -564,72 +1212,120 @@ class Dialect(PGDialect_psycopg2):
                 )
             return query
 
-    # FIXME: this method is a hack around the fact that we use a single cursor for all queries inside a connection,
-    #   and this is required to fix get_multi_columns
+    @multi_cache
     def get_multi_columns(
         self,
         connection: "Connection",
         schema: Optional[str] = None,
-        filter_names: Optional[Set[str]] = None,
-        scope: Optional[str] = None,
-        kind: Optional[Tuple[str, ...]] = None,
+        filter_names: Optional[Collection[str]] = None,
+        scope: Optional[Any] = None,
+        kind: Optional[Any] = None,
         **kw: Any,
     ) -> List:
         """
-        Copyright 2005-2023 SQLAlchemy authors and contributors <see AUTHORS file>.
-
-        Permission is hereby granted, free of charge, to any person obtaining a copy of
-        this software and associated documentation files (the "Software"), to deal in
-        the Software without restriction, including without limitation the rights to
-        use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
-        of the Software, and to permit persons to whom the Software is furnished to do
-        so, subject to the following conditions:
-
-        The above copyright notice and this permission notice shall be included in all
-        copies or substantial portions of the Software.
-
-        THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
-        IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
-        FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
-        AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
-        LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
-        OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
-        SOFTWARE.
+        Reflect the columns of every matching table and view with a single
+        ``duckdb_columns()`` query, rather than through the emulated ``pg_catalog``
         """
-
-        has_filter_names, params = self._prepare_filter_names(filter_names)  # type: ignore[attr-defined]
-        query = self._columns_query(schema, has_filter_names, scope, kind)  # type: ignore[attr-defined]
-        rows = list(connection.execute(query, params).mappings())
-
-        # dictionary with (name, ) if default search path or (schema, name)
-        # as keys
-        domains: Dict[tuple, dict] = {}
-        """
-        TODO: fix these pg_collation errors in SQLA2
-        domains = {
-            ((d["schema"], d["name"]) if not d["visible"] else (d["name"],)): d
-            for d in self._load_domains(  # type: ignore[attr-defined]
-                connection, schema="*", info_cache=kw.get("info_cache")
-            )
-        }
-        """
-
-        # dictionary with (name, ) if default search path or (schema, name)
-        # as keys
-        enums = dict(
-            (
-                ((rec["name"],), rec)
-                if rec["visible"]
-                else ((rec["schema"], rec["name"]), rec)
-            )
-            for rec in self._load_enums(  # type: ignore[attr-defined]
-                connection, schema="*", info_cache=kw.get("info_cache")
-            )
+        from sqlalchemy.engine.reflection import (  # type: ignore[attr-defined]
+            ObjectKind,
+            ObjectScope,
         )
 
-        columns = self._get_columns_info(rows, domains, enums, schema)  # type: ignore[attr-defined]
+        kind = ObjectKind.ANY if kind is None else kind
+        scope = ObjectScope.ANY if scope is None else scope
+        kinds = []
+        if ObjectKind.TABLE in kind:
+            kinds.append("table")
+        if ObjectKind.VIEW in kind:
+            kinds.append("view")
+        if not kinds:
+            return []
+
+        s = f"""
+            SELECT database_name, schema_name, table_name, column_name, data_type,
+                is_nullable, column_default, {"comment" if self.supports_comments else "NULL"}
+            FROM duckdb_columns()
+            JOIN (
+                SELECT database_name, schema_name, table_name, temporary, 'table' AS kind
+                FROM duckdb_tables()
+                UNION ALL
+                SELECT database_name, schema_name, view_name, temporary, 'view'
+                FROM duckdb_views()
+                WHERE NOT internal
+            ) USING (database_name, schema_name, table_name)
+            WHERE kind IN :kinds
+            """
+        sql, params = self._build_query_where(schema_name=schema)
+        s += sql
+        if scope is ObjectScope.DEFAULT:
+            s += "AND NOT temporary\n"
+        elif scope is ObjectScope.TEMPORARY:
+            s += "AND temporary\n"
+        binds: List[Any] = [bindparam("kinds", kinds, expanding=True)]
+        if filter_names:
+            s += "AND table_name IN :filter_names\n"
+            binds.append(bindparam("filter_names", list(filter_names), expanding=True))
+        s += """
+            ORDER BY
+                (database_name, schema_name) != (current_database(), current_schema()),
+                database_name, schema_name, table_name, column_index
+            """
+        query = text(s).bindparams(*binds)
+        rows = connection.execute(query, params).fetchall()
+
+        enum_names = {}
+        if any("ENUM(" in row[4] for row in rows):
+            named_enums = connection.execute(
+                text(
+                    "SELECT type_name, labels FROM duckdb_types() "
+                    "WHERE logical_type = 'ENUM' AND NOT internal"
+                )
+            ).fetchall()
+            for type_name, labels in named_enums:
+                enum_names[tuple(labels)] = type_name
+
+        columns: Dict[Tuple[Optional[str], str], List[Dict[str, Any]]] = {}
+        seen = set()
+        for (
+            database_name,
+            schema_name,
+            table_name,
+            name,
+            data_type,
+            nullable,
+            default,
+            comment,
+        ) in rows:
+            # without a schema, a table name is reflected from the first schema
+            # it's found in, starting with the current one
+            if (schema, table_name) in columns and (
+                database_name,
+                schema_name,
+                table_name,
+            ) not in seen:
+                continue
+            seen.add((database_name, schema_name, table_name))
+
+            try:
+                coltype = parse_type(data_type, self.ischema_names, enum_names)
+            except (KeyError, ValueError):
+                util.warn(f"Did not recognize type '{data_type}' of column '{name}'")
+                coltype = sqltypes.NULLTYPE
+
+            columns.setdefault((schema, table_name), []).append(
+                {
+                    "name": name,
+                    "type": coltype,
+                    "nullable": nullable,
+                    "default": default,
+                    "autoincrement": default is not None
+                    and default.startswith("nextval(")
+                    and isinstance(coltype, sqltypes.Integer),
+                    "comment": comment,
+                }
+            )
 
-        return columns.items()
+        return list(columns.items())
 
     # fix for https://github.com/Mause/duckdb_engine/issues/1128
     # (Overrides sqlalchemy method)
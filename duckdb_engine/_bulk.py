@@ -0,0 +1,216 @@
+"""
+Columnar rewrite of simple ``INSERT ... VALUES`` statements for ``executemany``
+
+DuckDB's ``executemany`` runs the statement once per parameter set, which is
+very slow for bulk loads. When a statement is a single-row
+``INSERT INTO t (cols) VALUES (...)``, the parameter sets are transposed into a
+pyarrow table, registered with the connection, and inserted with a single
+``INSERT INTO t (cols) SELECT ... FROM batch``.
+
+Lists, tuples and dicts (as bound for LIST, STRUCT and MAP columns) become
+nested Arrow arrays, which DuckDB casts to the column's type as it inserts.
+"""
+
+import re
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import duckdb
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# below this many parameter sets, registering a batch costs more than it saves
+BULK_INSERT_THRESHOLD = 16
+
+# types that pyarrow converts in a way DuckDB casts identically to a bound parameter
+_SCALAR_TYPES = frozenset(
+    {type(None), bool, int, float, str, bytes, Decimal, date, datetime, time}
+)
+
+_NESTED_TYPES = frozenset({list, tuple, dict})
+# the shape Map.bind_processor gives to MAP values
+_MAP_KEYS = frozenset({"key", "value"})
+
+_INSERT_VALUES_RE = re.compile(
+    r"^\s*INSERT\s+INTO\s+(?P<target>[^()]+?)\s*\((?P<columns>[^()]*)\)\s*"
+    r"VALUES\s*\((?P<values>.*)\)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\$\w+|\?|[()]")
+
+# (target, columns, select-list template, placeholder keys)
+_Rewrite = Tuple[str, str, List[Any], List[Any]]
+
+
+def _parse_insert(statement: str) -> Optional[_Rewrite]:
+    match = _INSERT_VALUES_RE.match(statement)
+    if match is None:
+        return None
+
+    values = match.group("values")
+    pieces: List[Any] = []
+    keys: List[Any] = []
+    position = depth = 0
+    sequential = 0
+    for token in _TOKEN_RE.finditer(values):
+        text = token.group()
+        if text == "(":
+            depth += 1
+            continue
+        elif text == ")":
+            depth -= 1
+            if depth < 0:
+                # more than one VALUES tuple, or trailing clauses
+                return None
+            continue
+        elif text == "?":
+            key: Any = sequential
+            sequential += 1
+        elif text.startswith("$"):
+            name = text[1:]
+            key = int(name) - 1 if name.isdigit() else name
+        else:
+            # a quoted literal or identifier, copied through untouched
+            continue
+        pieces.append(values[position : token.start()])
+        pieces.append(len(keys))
+        keys.append(key)
+        position = token.end()
+    pieces.append(values[position:])
+
+    if depth != 0 or not keys:
+        return None
+
+    return match.group("target"), match.group("columns"), pieces, keys
+
+
+def _is_scalar(value: Any) -> bool:
+    kind = type(value)
+    return kind in _SCALAR_TYPES and (kind is not datetime or value.tzinfo is None)
+
+
+def _is_nested(value: Any) -> bool:
+    kind = type(value)
+    if kind is dict:
+        return bool(value) and all(
+            type(key) is str and (_is_scalar(item) or _is_nested(item))
+            for key, item in value.items()
+        )
+    return kind in _NESTED_TYPES and all(
+        _is_scalar(item) or _is_nested(item) for item in value
+    )
+
+
+def _to_columns(keys: List[Any], parameters: Sequence[Any]) -> Optional[Dict[str, Any]]:
+    columns = {}
+    for index, key in enumerate(keys):
+        try:
+            column = [row[key] for row in parameters]
+        except (IndexError, KeyError, TypeError):
+            return None
+        for value in column:
+            kind = type(value)
+            if kind in _SCALAR_TYPES:
+                if kind is datetime and value.tzinfo is not None:
+                    return None
+            elif kind not in _NESTED_TYPES or not _is_nested(value):
+                return None
+        columns[f"p{index}"] = column
+    return columns
+
+
+def _is_map_value(value: Any) -> bool:
+    return (
+        type(value) is dict
+        and value.keys() == _MAP_KEYS
+        and type(value["key"]) is list
+        and type(value["value"]) is list
+    )
+
+
+def _to_array(column: List[Any]) -> "pyarrow.Array":
+    first = next((value for value in column if value is not None), None)
+    if not _is_map_value(first):
+        return pyarrow.array(column)
+    values = [value for value in column if value is not None]
+    if not all(map(_is_map_value, values)):
+        return pyarrow.array(column)
+
+    entries = [
+        None if value is None else list(zip(value["key"], value["value"]))
+        for value in column
+    ]
+    key_type = pyarrow.array([key for value in values for key in value["key"]]).type
+    value_type = pyarrow.array(
+        [item for value in values for item in value["value"]]
+    ).type
+    return pyarrow.array(entries, type=pyarrow.map_(key_type, value_type))
+
+
+def _prepare(
+    statement: str, parameters: Sequence[Any]
+) -> Optional[Tuple[_Rewrite, Dict[str, Any]]]:
+    if pyarrow is None or len(parameters) < BULK_INSERT_THRESHOLD:
+        return None
+
+    rewrite = _parse_insert(statement)
+    if rewrite is None:
+        return None
+
+    first = parameters[0]
+    if isinstance(first, Mapping) != all(isinstance(key, str) for key in rewrite[3]):
+        return None
+
+    data = _to_columns(rewrite[3], parameters)
+    if data is None:
+        return None
+    return rewrite, data
+
+
+def can_bulk_insert(statement: str, parameters: Sequence[Any]) -> bool:
+    """
+    Whether ``try_bulk_insert`` would (barring Arrow conversion errors) insert
+    ``parameters`` as a single columnar batch
+    """
+    return _prepare(statement, parameters) is not None
+
+
+def try_bulk_insert(
+    conn: duckdb.DuckDBPyConnection, statement: str, parameters: Sequence[Any]
+) -> bool:
+    """
+    Attempt to run ``statement`` for all ``parameters`` as a single columnar insert
+
+    Returns False, without touching the connection, when the statement or
+    parameters can't be rewritten and the caller should fall back to
+    ``executemany``
+    """
+    prepared = _prepare(statement, parameters)
+    if prepared is None:
+        return False
+    (target, columns, pieces, _), data = prepared
+    try:
+        batch = pyarrow.table(
+            {name: _to_array(column) for name, column in data.items()}
+        )
+    except (pyarrow.ArrowException, OverflowError):
+        return False
+
+    view_name = f"__duckdb_engine_batch_{uuid.uuid4().hex}"
+    select_list = "".join(
+        f'"{view_name}"."p{piece}"' if isinstance(piece, int) else piece
+        for piece in pieces
+    )
+    conn.register(view_name, batch)
+    try:
+        conn.execute(
+            f'INSERT INTO {target} ({columns}) SELECT {select_list} FROM "{view_name}"'
+        )
+    finally:
+        conn.unregister(view_name)
+    return True
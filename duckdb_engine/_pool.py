@@ -0,0 +1,107 @@
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, cast
+
+from sqlalchemy import pool
+
+if TYPE_CHECKING:
+    from . import ConnectionWrapper
+
+
+class DuckDBSharedPool(pool.QueuePool):
+    """
+    Pool that opens the database once, and hands out ``cursor()`` duplicates of
+    that connection
+
+    The duplicates share the database instance, and with it the buffer manager,
+    global settings and loaded extensions, so checking out a new connection
+    doesn't pay for opening the database, applying config or loading extensions.
+    Session level settings (such as ``search_path``) are not shared.
+
+    ```python
+    from duckdb_engine import DuckDBSharedPool
+
+    engine = create_engine(
+        "duckdb:///file.db", poolclass=DuckDBSharedPool, pool_size=8, max_overflow=4
+    )
+    ```
+
+    Pool size, overflow and timeouts behave as for ``QueuePool``.
+    """
+
+    _database: Optional["ConnectionWrapper"]
+    # the duplicates opened of _database
+    _duplicates: List["ConnectionWrapper"]
+    # databases dispose() was called for, while some of their duplicates were
+    # checked out
+    _retired: List[Tuple["ConnectionWrapper", List["ConnectionWrapper"]]]
+
+    def __init__(self, creator: Any, *args: Any, **kw: Any) -> None:
+        super().__init__(creator, *args, **kw)
+        self._open_database = self._invoke_creator
+        self._invoke_creator = self._open_duplicate  # type: ignore[assignment]
+        self._database = None
+        self._duplicates = []
+        self._retired = []
+        self._database_lock = threading.Lock()
+        self._databases_opened = 0
+        self._connections_opened = 0
+
+    def _open_duplicate(self, connection_record: Any) -> "ConnectionWrapper":
+        with self._database_lock:
+            database = self._database
+            if database is None:
+                database = cast(
+                    "ConnectionWrapper", self._open_database(connection_record)
+                )
+                self._database = database
+                self._databases_opened += 1
+            self._connections_opened += 1
+            duplicate = database.duplicate()
+            self._duplicates = [d for d in self._duplicates if not d.closed]
+            self._duplicates.append(duplicate)
+            return duplicate
+
+    def _do_return_conn(self, record: Any) -> None:
+        if self._retired:
+            if hasattr(record, "dbapi_connection"):
+                connection = record.dbapi_connection
+            else:  # sqlalchemy 1.3
+                connection = record.connection
+            with self._database_lock:
+                if any(connection in duplicates for _, duplicates in self._retired):
+                    # a new duplicate is opened if the record is checked out again
+                    record.close()
+                self._close_retired()
+        super()._do_return_conn(record)
+
+    def dispose(self) -> None:
+        """
+        Close the checked in connections, and the database once the checked out
+        ones have been returned
+        """
+        super().dispose()
+        with self._database_lock:
+            if self._database is not None:
+                self._retired.append((self._database, self._duplicates))
+                self._database, self._duplicates = None, []
+            self._close_retired()
+
+    def _close_retired(self) -> None:
+        # closing a database would also close its duplicates
+        retired = []
+        for database, duplicates in self._retired:
+            if all(duplicate.closed for duplicate in duplicates):
+                database.close()
+            else:
+                retired.append((database, duplicates))
+        self._retired = retired
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "databases_opened": self._databases_opened,
+            "connections_opened": self._connections_opened,
+        }
@@ -0,0 +1,120 @@
+"""
+Per-connection cache of prepared statements
+
+DuckDB's Python client prepares every parameterised statement it is given
+from scratch. Statements seen before are instead run as
+``EXECUTE name(literal, ...)`` against a ``PREPARE``-d statement, skipping the
+parser and planner.
+
+The Python client can't bind parameters to ``EXECUTE``, so this only applies
+when every parameter can be written out as a literal with the same type DuckDB
+would have bound it as.
+"""
+
+import math
+import re
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+import duckdb
+
+# statements that change the catalog, and so may change what a prepared
+# statement refers to
+_DDL_RE = re.compile(
+    r"\s*(CREATE|ALTER|DROP|ATTACH|DETACH|USE|IMPORT|LOAD|INSTALL)\b", re.IGNORECASE
+)
+_PREPARABLE_RE = re.compile(
+    r"\s*(SELECT|WITH|INSERT|UPDATE|DELETE|FROM|VALUES)\b", re.IGNORECASE
+)
+_INT64 = 2**63
+
+
+def _literal(value: Any) -> Optional[str]:
+    kind = type(value)
+    if value is None:
+        return "NULL"
+    elif kind is bool:
+        return "TRUE" if value else "FALSE"
+    elif kind is int:
+        return str(value) if -_INT64 <= value < _INT64 else None
+    elif kind is float:
+        return f"{value!r}::DOUBLE" if math.isfinite(value) else None
+    elif kind is str:
+        return None if "\x00" in value else "'{}'".format(value.replace("'", "''"))
+    return None
+
+
+class PreparedStatementCache:
+    """
+    LRU of statement text to the name it was ``PREPARE``-d as on one connection
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        # None marks statements that DuckDB refused to prepare
+        self.statements: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.counter = 0
+
+    def execute_statement(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        statement: str,
+        parameters: Sequence[Any],
+    ) -> Optional[str]:
+        """
+        Return an ``EXECUTE`` statement equivalent to running ``statement`` with
+        ``parameters``, preparing ``statement`` if needed, or None to have the
+        caller run ``statement`` directly
+        """
+        if not isinstance(parameters, (list, tuple)):
+            return None
+        literals = []
+        for value in parameters:
+            literal = _literal(value)
+            if literal is None:
+                return None
+            literals.append(literal)
+
+        if statement in self.statements:
+            self.statements.move_to_end(statement)
+            name = self.statements[statement]
+        elif _PREPARABLE_RE.match(statement):
+            name = self._prepare(conn, statement)
+        else:
+            return None
+
+        if name is None:
+            return None
+        elif not literals:
+            return f"EXECUTE {name}"
+        return "EXECUTE {}({})".format(name, ", ".join(literals))
+
+    def _prepare(
+        self, conn: duckdb.DuckDBPyConnection, statement: str
+    ) -> Optional[str]:
+        self.counter += 1
+        name: Optional[str] = f"__duckdb_engine_prepared_{self.counter}"
+        try:
+            conn.execute(f"PREPARE {name} AS {statement}")
+        except duckdb.Error:
+            name = None
+        self.statements[statement] = name
+
+        while len(self.statements) > self.size:
+            _, evicted = self.statements.popitem(last=False)
+            if evicted is not None:
+                conn.execute(f"DEALLOCATE {evicted}")
+        return name
+
+    def invalidate(self, conn: duckdb.DuckDBPyConnection, statement: str) -> None:
+        """
+        Drop every prepared statement when ``statement`` is DDL
+        """
+        if self.statements and _DDL_RE.match(statement):
+            self.clear(conn)
+
+    def clear(self, conn: duckdb.DuckDBPyConnection) -> None:
+        for name in self.statements.values():
+            if name is not None:
+                conn.execute(f"DEALLOCATE {name}")
+        self.statements.clear()
@@ -0,0 +1,59 @@
+"""
+Per statement profiling, enabled with ``execution_options(duckdb_profile=True)``
+
+DuckDB writes the profile of a statement once its result has been read, so
+the result of a profiled statement is fetched as rows up front. The profile
+is then available as ``result.context.duckdb_profile`` and logged to the
+``duckdb_engine`` logger.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+import duckdb
+
+RESET_PROFILING = "RESET enable_profiling; RESET profiling_output"
+
+
+def start_profiling(conn: duckdb.DuckDBPyConnection) -> str:
+    """
+    Have DuckDB profile the following statements, returning the path the
+    profile is written to
+    """
+    fd, path = tempfile.mkstemp(prefix="duckdb_engine_profile_", suffix=".json")
+    os.close(fd)
+    quoted = path.replace("'", "''")
+    try:
+        conn.execute(
+            f"SET enable_profiling = 'json'; SET profiling_output = '{quoted}'"
+        )
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def stop_profiling(conn: duckdb.DuckDBPyConnection) -> bool:
+    """
+    Restore the profiling settings, which can't be done in an aborted
+    transaction, in which case False is returned
+    """
+    try:
+        conn.execute(RESET_PROFILING)
+    except duckdb.Error:
+        # which error depends on the version, eg InvalidInputException on 1.0
+        return False
+    return True
+
+
+def read_profile(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # nothing was written, as the statement failed
+        return None
+    finally:
+        os.unlink(path)
@@ -0,0 +1,215 @@
+"""
+Opt-in on-disk cache of reflection results
+
+Enabled with ``create_engine(url, reflection_cache="/some/dir")``. Each
+``Inspector`` gets a ``PersistentInfoCache`` in place of its ``info_cache``
+dictionary, which is seeded from, and written back to, a pickle file per
+database file. The file is keyed by a fingerprint of the catalog (the DDL of
+every table, view, index and type, and all comments), so any schema change
+starts the cache afresh.
+"""
+
+import hashlib
+import os
+import pickle
+import weakref
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.url import URL
+
+T = TypeVar("T")
+
+_FINGERPRINT_QUERY = """
+    SELECT md5(coalesce(string_agg(entry, chr(10) ORDER BY entry), ''))
+    FROM (
+        SELECT concat_ws(chr(0), 'table', database_name, schema_name, table_name, sql{table_comment}) AS entry
+        FROM duckdb_tables()
+        UNION ALL
+        SELECT concat_ws(chr(0), 'view', database_name, schema_name, view_name, sql{table_comment})
+        FROM duckdb_views() WHERE NOT internal
+        UNION ALL
+        SELECT concat_ws(chr(0), 'index', database_name, schema_name, index_name, sql)
+        FROM duckdb_indexes()
+        UNION ALL
+        SELECT concat_ws(chr(0), 'type', database_name, schema_name, type_name, logical_type, labels::VARCHAR)
+        FROM duckdb_types() WHERE NOT internal
+        {column_comments}
+    )
+"""
+
+_COLUMN_COMMENTS = """
+        UNION ALL
+        SELECT concat_ws(chr(0), 'column', database_name, schema_name, table_name, column_name, comment)
+        FROM duckdb_columns() WHERE comment IS NOT NULL
+"""
+
+
+def catalog_fingerprint(bind: Union[Engine, Connection], comments: bool) -> str:
+    query = text(
+        _FINGERPRINT_QUERY.format(
+            table_comment=", comment" if comments else "",
+            column_comments=_COLUMN_COMMENTS if comments else "",
+        )
+    )
+    if isinstance(bind, Connection):
+        return str(bind.execute(query).scalar())
+    with bind.connect() as conn:
+        return str(conn.execute(query).scalar())
+
+
+def database_path(url: URL) -> Optional[str]:
+    """
+    The absolute path of the main database file, or None for in-memory and
+    remote databases, which have nothing to key a cache on
+    """
+    database = url.database
+    if not database or database.startswith(":memory:"):
+        return None
+    path = os.path.abspath(database)
+    return path if os.path.isfile(path) else None
+
+
+def _is_persistent(key: Any) -> bool:
+    # only the public reflection methods (and the enum lookup they share) are
+    # written out, not cached query constructs. Nor are OIDs, which are handed
+    # out as the catalog is loaded, so differ between processes when an
+    # object the fingerprint doesn't cover (eg a sequence) comes and goes
+    return (
+        isinstance(key, tuple)
+        and bool(key)
+        and isinstance(key[0], str)
+        and (key[0].startswith("get_") or key[0] == "_load_enums")
+        and not key[0].endswith(("_oid", "_oids"))
+    )
+
+
+class _CacheFile:
+    def __init__(self, path: str, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "rb") as fh:
+                stored = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return {}
+        if (
+            not isinstance(stored, dict)
+            or stored.get("fingerprint") != self.fingerprint
+        ):
+            return {}
+        return stored.get("entries", {})
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        self.dirty = False
+
+        entries = {}
+        for key, value in self.entries.items():
+            try:
+                pickle.dumps(value)
+            except Exception:
+                continue
+            entries[key] = value
+
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "wb") as fh:
+                pickle.dump({"fingerprint": self.fingerprint, "entries": entries}, fh)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+class PersistentInfoCache(dict):
+    """
+    ``info_cache`` that looks up misses in, and writes new entries back to, a
+    cache file
+
+    New entries are written out once, when the cache is garbage collected
+    (normally along with its ``Inspector``) or ``flush()`` is called.
+    """
+
+    def __init__(
+        self, cache_dir: str, database: str, fingerprint: Callable[[], str]
+    ) -> None:
+        super().__init__()
+        name = hashlib.sha1(database.encode()).hexdigest()
+        self.path = os.path.join(cache_dir, f"{name}.pickle")
+        self.fingerprint = fingerprint
+        self._file: Optional[_CacheFile] = None
+
+    @property
+    def file(self) -> _CacheFile:
+        # the fingerprint is only taken once something is looked up, as
+        # inspectors replace their info_cache freely
+        if self._file is None:
+            self._file = _CacheFile(self.path, self.fingerprint())
+            weakref.finalize(self, self._file.flush)
+        return self._file
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        if _is_persistent(key):
+            value = self.file.entries.get(repr(key))
+            if value is not None:
+                super().__setitem__(key, value)
+                return value
+        return default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        if _is_persistent(key) and value is not None:
+            self.file.entries[repr(key)] = value
+            self.file.dirty = True
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value, key=repr))
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def multi_cache(fn: Callable[..., Iterable[T]]) -> Callable[..., Iterable[T]]:
+    """
+    Like ``sqlalchemy.engine.reflection.cache``, for the ``get_multi_*``
+    methods, whose ``filter_names`` may be unhashable, and whose results may be
+    one-shot iterators
+    """
+
+    @wraps(fn)
+    def cached(self: Any, connection: Connection, *args: Any, **kw: Any) -> Iterable[T]:
+        info_cache = kw.get("info_cache")
+        if info_cache is None:
+            return list(fn(self, connection, *args, **kw))
+        key: Tuple = (
+            fn.__name__,
+            tuple(_normalize(a) for a in args),
+            tuple(
+                (k, _normalize(v))
+                for k, v in kw.items()
+                if k not in ("info_cache", "unreflectable")
+            ),
+        )
+        result = info_cache.get(key)
+        if result is None:
+            result = list(fn(self, connection, *args, **kw))
+            info_cache[key] = result
+        return result
+
+    return cached
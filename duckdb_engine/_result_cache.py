@@ -0,0 +1,133 @@
+"""
+Opt-in cache of query results for read-only databases
+
+Enabled with ``connect_args={"read_only": True, "result_cache_size": n}``.
+Results of ``SELECT`` statements are kept as pyarrow tables, keyed by the
+compiled statement and its parameters, in a least recently used cache of at
+most ``n`` bytes shared by every connection of the engine. A change to the
+database file's modification time empties the cache.
+
+A read only database still allows temporary tables, registered views and
+settings, which only the connection that made them sees. So once a connection
+has run anything but a query, it stops using the cache, which is emptied in
+case the change is seen by others.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pyarrow
+
+_QUERY_RE = re.compile(r"\s*(SELECT|WITH|FROM)\b", re.IGNORECASE)
+_READ_RE = re.compile(
+    r"\s*(SELECT|WITH|FROM|SHOW|DESCRIBE|SUMMARIZE|EXPLAIN"
+    r"|BEGIN|START|COMMIT|END|ROLLBACK|ABORT)\b",
+    re.IGNORECASE,
+)
+# which a WITH or EXPLAIN ANALYZE statement may also run
+_WRITE_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|COPY)\b", re.IGNORECASE)
+
+# (description, table)
+CachedResult = Tuple[List[Tuple], "pyarrow.Table"]
+
+
+def is_read(statement: str) -> bool:
+    """
+    Whether ``statement`` can't change what the connection's queries return,
+    erring on the side of False
+    """
+    match = _READ_RE.match(statement)
+    if match is None or ";" in statement.rstrip().rstrip(";"):
+        # several statements are run together
+        return False
+    if match.group(1).upper() in ("WITH", "EXPLAIN"):
+        return not _WRITE_RE.search(statement)
+    return True
+
+
+def result_cache_key(
+    statement: str, parameters: Optional[Sequence[Any]]
+) -> Optional[Hashable]:
+    """
+    The cache key of a statement, or None when it shouldn't be cached
+    """
+    if not _QUERY_RE.match(statement) or not is_read(statement):
+        return None
+    key = (statement, tuple(parameters) if parameters else ())
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def is_read_only(cparams: dict) -> bool:
+    access_mode = str(cparams.get("config", {}).get("access_mode", ""))
+    return bool(cparams.get("read_only")) or access_mode.upper() == "READ_ONLY"
+
+
+class ResultCache:
+    """
+    Byte bounded LRU of query results for one database file
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        import pyarrow  # noqa: F401  results are stored as arrow tables
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self.results: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._mtime = self._file_mtime()
+        self._lock = threading.Lock()
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_file(self) -> None:
+        mtime = self._file_mtime()
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self.results.clear()
+            self.nbytes = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        with self._lock:
+            self._check_file()
+            result = self.results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.results.move_to_end(key)
+            return result
+
+    def put(
+        self, key: Hashable, description: List[Tuple], table: "pyarrow.Table"
+    ) -> None:
+        size = table.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._check_file()
+            previous = self.results.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1].nbytes
+            self.results[key] = (description, table)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self.results.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self.results.clear()
+            self.nbytes = 0
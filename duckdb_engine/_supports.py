@@ -1,12 +1,79 @@
+import json
+import os
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
 import duckdb
 from packaging.version import Version
 
 duckdb_version = Version(duckdb.__version__)
 
+T = TypeVar("T")
+
+# directory to persist probe results in, keyed by duckdb version, so that
+# short lived processes don't need to open a database to find out what it supports
+CAPABILITY_CACHE_DIR = "DUCKDB_ENGINE_CAPABILITY_CACHE"
+
 
 has_uhugeint_support = duckdb_version >= Version("0.10.0")
 
 
+def _cache_path() -> Optional[str]:
+    cache_dir = os.environ.get(CAPABILITY_CACHE_DIR)
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"capabilities-{duckdb.__version__}.json")
+
+
+def _read_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as fh:
+            cached = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def _write_cache(path: str, name: str, value: Any) -> None:
+    cached = _read_cache(path)
+    cached[name] = value
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w") as fh:
+            json.dump(cached, fh)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def capability(probe: Callable[[], T]) -> Callable[[], T]:
+    """
+    Run ``probe`` at most once per process, and, when the
+    ``DUCKDB_ENGINE_CAPABILITY_CACHE`` environment variable names a directory,
+    at most once per DuckDB version
+
+    ``probe`` must return a JSON serializable value
+    """
+
+    @lru_cache()
+    @wraps(probe)
+    def cached() -> T:
+        path = _cache_path()
+        if path is None:
+            return probe()
+        name = probe.__name__
+        stored = _read_cache(path)
+        if name in stored:
+            return stored[name]
+        value = probe()
+        _write_cache(path, name, value)
+        return value
+
+    return cached
+
+
+@capability
 def has_comment_support() -> bool:
     """
     See https://github.com/duckdb/duckdb/pull/10372
@@ -18,3 +85,19 @@ def has_comment_support() -> bool:
     except duckdb.ParserException:
         return False
     return True
+
+
+@capability
+def reserved_keywords() -> List[str]:
+    with duckdb.connect(":memory:") as con:
+        rows = con.execute(
+            "select keyword_name from duckdb_keywords() where keyword_category == 'reserved'"
+        ).fetchall()
+    return sorted(keyword_name for (keyword_name,) in rows)
+
+
+@capability
+def core_settings() -> List[str]:
+    with duckdb.connect(":memory:") as con:
+        rows = con.execute("SELECT name FROM duckdb_settings()").fetchall()
+    return sorted(name for (name,) in rows)
@@ -0,0 +1,244 @@
+"""
+asyncio support, for use with ``create_async_engine``
+
+```python
+from sqlalchemy.ext.asyncio import create_async_engine
+
+engine = create_async_engine("duckdb+async:///file.db")
+```
+
+DuckDB has no asynchronous client, so every call that may block (connecting,
+executing statements, fetching rows and transaction control) is run on a
+thread pool owned by the dialect, while the event loop waits on the result.
+Arrow and DataFrame results can only be fetched from streamed results
+(``AsyncConnection.stream()``), as other results are fetched as rows up front.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import event, pool
+from sqlalchemy.engine import AdaptedConnection
+from sqlalchemy.engine.url import URL
+from sqlalchemy.util.concurrency import await_only
+
+from . import ConnectionWrapper, CursorWrapper, Dialect
+
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow
+    from sqlalchemy.engine import Engine
+
+T = TypeVar("T")
+
+
+class AsyncAdapt_duckdb_cursor:
+    """
+    DBAPI cursor that runs a ``CursorWrapper``'s blocking calls on the
+    dialect's thread pool
+
+    As SQLAlchemy reads rows of an async result without awaiting, they are all
+    fetched along with the statement, unless ``stream_results`` (a server side
+    cursor) was asked for.
+    """
+
+    _rows: Optional[Deque[Tuple]] = None
+
+    def __init__(
+        self, adapt_connection: "AsyncAdapt_duckdb_connection", cursor: CursorWrapper
+    ) -> None:
+        self._adapt_connection = adapt_connection
+        self._cursor = cursor
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        return self._adapt_connection._run(fn, *args)
+
+    @property
+    def description(self) -> Optional[List[Tuple]]:
+        return self._cursor.description
+
+    def execute(
+        self,
+        statement: str,
+        parameters: Optional[Tuple] = None,
+        context: Optional[Any] = None,
+    ) -> None:
+        self._rows = self._run(self._execute, statement, parameters, context)
+
+    def _execute(
+        self, statement: str, parameters: Optional[Tuple], context: Optional[Any]
+    ) -> Optional[Deque[Tuple]]:
+        self._cursor.execute(statement, parameters, context)
+        if self._cursor.server_side or self._cursor.description is None:
+            return None
+        return deque(self._cursor.fetchall())
+
+    def executemany(
+        self,
+        statement: str,
+        parameters: Optional[List[Any]] = None,
+        context: Optional[Any] = None,
+    ) -> None:
+        self._rows = None
+        self._run(self._cursor.executemany, statement, parameters, context)
+
+    def fetchone(self) -> Optional[Tuple]:
+        if self._rows is not None:
+            return self._rows.popleft() if self._rows else None
+        return self._run(self._cursor.fetchone)
+
+    def fetchmany(self, size: Optional[int] = None) -> List:
+        if self._rows is not None:
+            rows = self._rows
+            size = self._cursor.arraysize if size is None else size
+            return [rows.popleft() for _ in range(min(size, len(rows)))]
+        return self._run(self._cursor.fetchmany, size)
+
+    def fetchall(self) -> List:
+        if self._rows is not None:
+            rows = list(self._rows)
+            self._rows.clear()
+            return rows
+        return self._run(self._cursor.fetchall)
+
+    def fetch_arrow_table(self, rows_per_batch: int = 1_000_000) -> "pyarrow.Table":
+        return self._run(self._cursor.fetch_arrow_table, rows_per_batch)
+
+    def fetch_record_batch(
+        self, rows_per_batch: int = 1_000_000
+    ) -> "pyarrow.RecordBatchReader":
+        return self._run(self._cursor.fetch_record_batch, rows_per_batch)
+
+    def fetch_df(self) -> "pandas.DataFrame":
+        return self._run(self._cursor.fetch_df)
+
+    def fetch_df_chunk(self, vectors_per_chunk: int = 1) -> "pandas.DataFrame":
+        return self._run(self._cursor.fetch_df_chunk, vectors_per_chunk)
+
+    def close(self) -> None:
+        self._rows = None
+        self._cursor.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+class AsyncAdapt_duckdb_connection(AdaptedConnection):
+    """
+    DBAPI connection that runs a ``ConnectionWrapper``'s blocking calls on the
+    dialect's thread pool
+    """
+
+    await_ = staticmethod(await_only)
+
+    def __init__(self, connection: ConnectionWrapper, dialect: "AsyncDialect"):
+        self._connection = connection
+        self._dialect = dialect
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        executor = self._dialect._executor()
+        return self.await_(loop.run_in_executor(executor, partial(fn, *args)))
+
+    def cursor(self, name: Optional[str] = None) -> AsyncAdapt_duckdb_cursor:
+        return AsyncAdapt_duckdb_cursor(self, self._connection.cursor(name))
+
+    def begin(self) -> None:
+        self._run(self._connection.begin)
+
+    def commit(self) -> None:
+        self._run(self._connection.commit)
+
+    def rollback(self) -> None:
+        self._run(self._connection.rollback)
+
+    def close(self) -> None:
+        self._run(self._connection.close)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+
+class AsyncDialect(Dialect):
+    """
+    ``duckdb+async://`` dialect
+    """
+
+    driver = "async"
+    is_async = True
+    supports_statement_cache = True
+
+    _thread_pool: Optional[ThreadPoolExecutor] = None
+
+    def __init__(self, thread_pool_size: Optional[int] = None, **kwargs: Any) -> None:
+        """
+        :param thread_pool_size: the number of threads to run DuckDB calls on,
+            defaults to ``ThreadPoolExecutor``'s default
+        """
+        super().__init__(**kwargs)
+        self._thread_pool_size = thread_pool_size
+        self._thread_pool_lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """
+        The thread pool, which is started on first use, and again after the
+        engine has been disposed
+        """
+        with self._thread_pool_lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    self._thread_pool_size, thread_name_prefix="duckdb_engine"
+                )
+            return self._thread_pool
+
+    def _shutdown_executor(self) -> None:
+        with self._thread_pool_lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+        if thread_pool is not None:
+            # calls already running finish first, without blocking the loop
+            thread_pool.shutdown(wait=False)
+
+    @classmethod
+    def engine_created(cls, engine: "Engine") -> None:
+        event.listen(
+            engine,
+            "engine_disposed",
+            lambda engine: engine.dialect._shutdown_executor(),
+        )
+
+    def connect(self, *cargs: Any, **cparams: Any) -> AsyncAdapt_duckdb_connection:  # type: ignore[override]
+        loop = asyncio.get_running_loop()
+        connection = await_only(
+            loop.run_in_executor(
+                self._executor(), partial(super().connect, *cargs, **cparams)
+            )
+        )
+        return AsyncAdapt_duckdb_connection(connection, self)
+
+    @classmethod
+    def get_pool_class(cls, url: URL) -> Type[pool.Pool]:
+        if url.database == ":memory:":
+            # each connection would otherwise open its own empty database
+            return pool.StaticPool
+        else:
+            return pool.AsyncAdaptedQueuePool
+
+    def get_driver_connection(self, connection: Any) -> ConnectionWrapper:
+        return connection._connection
+
+
+dialect = AsyncDialect
@@ -0,0 +1,61 @@
+"""
+Fetch results of SQLAlchemy statements as Arrow data
+
+```python
+from duckdb_engine import fetch_arrow_table, fetch_record_batch
+
+with engine.connect() as conn:
+    table = fetch_arrow_table(conn.execute(select(...)))
+
+    for batch in fetch_record_batch(conn.execute(select(...)), 100_000):
+        ...
+```
+
+The columns are read straight from DuckDB, without building a Python object
+per row, so SQLAlchemy result processors are not applied to them.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc
+
+if TYPE_CHECKING:
+    import pyarrow
+
+    from . import CursorWrapper
+
+
+def _cursor(result: Any) -> "CursorWrapper":
+    cursor = getattr(result, "cursor", None)
+    if cursor is None:
+        raise exc.ResourceClosedError("This result object is closed.")
+    if not hasattr(cursor, "fetch_record_batch"):
+        raise exc.InvalidRequestError(
+            "Arrow fetching requires a result from the duckdb dialect"
+        )
+    if cursor.rows_fetched:
+        raise exc.InvalidRequestError(
+            "Rows have already been fetched from this result"
+            " (results with stream_results=True prefetch a row)"
+        )
+    return cursor
+
+
+def fetch_arrow_table(result: Any, rows_per_batch: int = 1_000_000) -> "pyarrow.Table":
+    """
+    Fetch the whole of ``result`` as a ``pyarrow.Table``, then close it
+    """
+    table = _cursor(result).fetch_arrow_table(rows_per_batch)
+    result.close()
+    return table
+
+
+def fetch_record_batch(
+    result: Any, rows_per_batch: int = 1_000_000
+) -> "pyarrow.RecordBatchReader":
+    """
+    Stream ``result`` as a ``pyarrow.RecordBatchReader`` of ``rows_per_batch`` rows
+
+    The reader is only valid until the next statement is executed on the connection
+    """
+    return _cursor(result).fetch_record_batch(rows_per_batch)
@@ -1,11 +1,14 @@
 from functools import lru_cache
-from typing import Dict, Set, Type, Union
+from typing import Any, Dict, Sequence, Set, Type, Union
+from weakref import WeakKeyDictionary
 
 import duckdb
 from sqlalchemy import Boolean, Integer, String
 from sqlalchemy.engine import Dialect
 from sqlalchemy.sql.type_api import TypeEngine
 
+from ._supports import core_settings
+
 TYPES: Dict[Type, TypeEngine] = {int: Integer(), str: String(), bool: Boolean()}
 
 
@@ -15,23 +18,39 @@ def get_core_config() -> Set[str]:
     # See: https://motherduck.com/docs/key-tasks/authenticating-and-connecting-to-motherduck/authenticating-to-motherduck/
     motherduck_config_keys = {"motherduck_token", "attach_mode", "saas_mode"}
 
-    rows = (
-        duckdb.connect(":memory:")
-        .execute("SELECT name FROM duckdb_settings()")
-        .fetchall()
-    )
-    return {name for (name,) in rows} | motherduck_config_keys
+    return set(core_settings()) | motherduck_config_keys
+
+
+_processors: "WeakKeyDictionary[Dialect, Dict[Type, Any]]" = WeakKeyDictionary()
+
+
+def _literal_processors(dialect: Dialect) -> Dict[Type, Any]:
+    processors = _processors.get(dialect)
+    if processors is None:
+        processors = {k: v.literal_processor(dialect=dialect) for k, v in TYPES.items()}
+        _processors[dialect] = processors
+    return processors
 
 
 def apply_config(
     dialect: Dialect,
     conn: duckdb.DuckDBPyConnection,
     ext: Dict[str, Union[str, int, bool]],
+    preload_extensions: Sequence[str] = (),
 ) -> None:
+    """
+    Load ``preload_extensions`` then apply the settings in ``ext``, in a single
+    statement
+    """
     # TODO: does sqlalchemy have something that could do this for us?
-    processors = {k: v.literal_processor(dialect=dialect) for k, v in TYPES.items()}
+    processors = _literal_processors(dialect)
 
+    # DuckDB skips loading extensions that are already loaded
+    statements = [f"LOAD {extension}" for extension in preload_extensions]
     for k, v in ext.items():
         process = processors[type(v)]
         assert process, f"Not able to configure {k} with {v}"
-        conn.execute(f"SET {k} = {process(v)}")
+        statements.append(f"SET {k} = {process(v)}")
+
+    if statements:
+        conn.execute(";\n".join(statements))
@@ -0,0 +1,161 @@
+"""
+``COPY`` statements as SQLAlchemy constructs
+
+```python
+from duckdb_engine import CopyFrom, CopyTo
+
+with engine.begin() as conn:
+    loaded = conn.execute(CopyFrom(table, "data/*.parquet")).scalar()
+
+    conn.execute(CopyTo(select(table), "export", partition_by=["year"]))
+```
+
+The files are read and written by DuckDB itself, in parallel, without the
+rows passing through Python.
+"""
+
+import re
+from typing import Any, Mapping, Optional, Sequence, Union
+
+import sqlalchemy
+from sqlalchemy import exc
+from sqlalchemy import table as table_clause
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable, TableClause
+
+_OPTION_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def render_string(value: str) -> str:
+    """
+    ``value`` as a SQL string literal, DuckDB doesn't treat backslashes as escapes
+    """
+    return "'{}'".format(value.replace("'", "''"))
+
+
+def render_option_value(compiler: SQLCompiler, value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, (int, float)):
+        return repr(value)
+    elif isinstance(value, str):
+        return render_string(value)
+    elif isinstance(value, (list, tuple)):
+        # eg the columns of PARTITION_BY or FORCE_NOT_NULL
+        return "({})".format(", ".join(compiler.preparer.quote(v) for v in value))
+    raise exc.CompileError(f"Unsupported option value {value!r}")
+
+
+def render_options(
+    compiler: SQLCompiler, format: Optional[str], options: Mapping[str, Any]
+) -> str:
+    """
+    The parenthesised option list of a COPY statement, or an empty string
+    """
+    items = dict(options)
+    if format is not None:
+        items = {"format": format, **items}
+    rendered = []
+    for name, value in items.items():
+        if not _OPTION_RE.match(name):
+            raise exc.CompileError(f"Invalid option name {name!r}")
+        if name.lower() == "format" and isinstance(value, str):
+            if not _OPTION_RE.match(value):
+                raise exc.CompileError(f"Invalid format {value!r}")
+            rendered.append(f"FORMAT {value.upper()}")
+        else:
+            rendered.append(f"{name.upper()} {render_option_value(compiler, value)}")
+    return " ({})".format(", ".join(rendered)) if rendered else ""
+
+
+class CopyFrom(Executable, ClauseElement):
+    """
+    ``COPY table FROM 'path'``, which loads the file(s) at ``path`` into
+    ``table``, returning the number of rows loaded
+
+    :param table: a ``Table``, or the name of one
+    :param path: a file, glob or URL DuckDB can read
+    :param format: eg ``"parquet"`` or ``"csv"``, by default inferred from
+        the path
+    :param options: further options of the statement, such as
+        ``{"header": True, "delimiter": "|"}``
+    """
+
+    inherit_cache = False
+    if sqlalchemy.__version__ < "2":
+        _execution_options = Executable._execution_options.union({"autocommit": True})
+
+    def __init__(
+        self,
+        table: Union[str, TableClause],
+        path: str,
+        format: Optional[str] = None,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self.table = table_clause(table) if isinstance(table, str) else table
+        self.path = path
+        self.format = format
+        self.copy_options = dict(options or {})
+
+
+@compiles(CopyFrom, "duckdb")  # type: ignore[misc]
+def visit_copy_from(instance: CopyFrom, compiler: SQLCompiler, **kw: Any) -> str:
+    return "COPY {} FROM {}{}".format(
+        compiler.preparer.format_table(instance.table),
+        render_string(instance.path),
+        render_options(compiler, instance.format, instance.copy_options),
+    )
+
+
+class CopyTo(Executable, ClauseElement):
+    """
+    ``COPY (query) TO 'path'``, which writes the rows of ``selectable`` to
+    ``path``, returning the number of rows written (before DuckDB 1.1, 0 for
+    partitioned writes)
+
+    :param selectable: a ``select()``, ``text()`` query or ``Table``
+    :param path: the file to write, or with ``partition_by`` the directory
+    :param format: eg ``"parquet"`` or ``"csv"``, by default inferred from
+        the path
+    :param partition_by: columns to write a hive partitioned directory by,
+        with one ``column=value`` directory per value
+    :param compression: eg ``"zstd"`` or ``"gzip"``
+    :param options: further options of the statement, such as
+        ``{"overwrite_or_ignore": True}``
+    """
+
+    inherit_cache = False
+    if sqlalchemy.__version__ < "2":
+        _execution_options = Executable._execution_options.union({"autocommit": True})
+
+    def __init__(
+        self,
+        selectable: Any,
+        path: str,
+        format: Optional[str] = "parquet",
+        partition_by: Optional[Sequence[str]] = None,
+        compression: Optional[str] = None,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self.selectable = selectable
+        self.path = path
+        self.format = format
+        self.copy_options = dict(options or {})
+        if partition_by:
+            self.copy_options["partition_by"] = list(partition_by)
+        if compression is not None:
+            self.copy_options["compression"] = compression
+
+
+@compiles(CopyTo, "duckdb")  # type: ignore[misc]
+def visit_copy_to(instance: CopyTo, compiler: SQLCompiler, **kw: Any) -> str:
+    if isinstance(instance.selectable, TableClause):
+        source = compiler.preparer.format_table(instance.selectable)
+    else:
+        source = "({})".format(compiler.process(instance.selectable, **kw))
+    return "COPY {} TO {}{}".format(
+        source,
+        render_string(instance.path),
+        render_options(compiler, instance.format, instance.copy_options),
+    )
@@ -0,0 +1,177 @@
+"""
+Fast paths between pandas DataFrames and DuckDB
+
+```python
+from duckdb_engine import insert_dataframe, read_sql
+
+df.to_sql("table", engine, method=insert_dataframe())
+
+df = read_sql(select(...), engine)
+```
+
+``insert_dataframe`` registers each chunk of the DataFrame with DuckDB and
+inserts it with a single ``INSERT INTO ... SELECT``, so DuckDB scans the
+DataFrame's columns directly, instead of binding one set of parameters per row.
+
+``read_sql`` has DuckDB build the DataFrame from its result columns, rather
+than SQLAlchemy creating a row object per row for pandas to take apart again.
+"""
+
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from .arrow import _cursor
+
+if TYPE_CHECKING:
+    import pandas
+    from pandas.io.sql import SQLTable
+
+# rows in each of the vectors fetch_df_chunk counts in
+VECTOR_SIZE = 2048
+
+
+def insert_dataframe() -> Callable[["SQLTable", Any, List[str], Iterable[Tuple]], int]:
+    """
+    A ``method`` for ``DataFrame.to_sql`` that inserts each chunk as a DataFrame
+    scan, eg ``df.to_sql("table", engine, method=insert_dataframe())``
+    """
+    # pandas calls the method once per chunk, in order. Its data_iter only
+    # tells us how many rows are in the chunk, the rows themselves are sliced
+    # from the DataFrame being written
+    current: Optional["SQLTable"] = None
+    frame: Any = None
+    start = 0
+
+    def insert(
+        table: "SQLTable", conn: Any, keys: List[str], data_iter: Iterable[Tuple]
+    ) -> int:
+        nonlocal current, frame, start
+        rows = sum(1 for _ in data_iter)
+        if not rows:
+            return 0
+
+        if current is not table:
+            # the first chunk of a to_sql call
+            current, frame, start = table, table.frame, 0
+            if table.index is not None:
+                frame = frame.copy(deep=False)
+                frame.index.names = table.index
+                frame = frame.reset_index()
+        chunk = frame.iloc[start : start + rows]
+        start += rows
+
+        preparer = conn.dialect.identifier_preparer
+        view_name = f"__duckdb_engine_frame_{uuid.uuid4().hex}"
+        conn.execute(text("register(:name, :df)"), {"name": view_name, "df": chunk})
+        try:
+            insert_sql = 'INSERT INTO {} ({}) SELECT * FROM "{}"'.format(
+                preparer.format_table(table.table),
+                ", ".join(preparer.quote(str(key)) for key in keys),
+                view_name,
+            )
+            # colons in the names aren't bind parameters
+            conn.execute(text(insert_sql.replace(":", "\\:")))
+        finally:
+            conn.execute(text(f'DROP VIEW "{view_name}"'))
+        return rows
+
+    return insert
+
+
+def read_sql(
+    sql: Any,
+    con: Union[Engine, Connection],
+    index_col: Union[None, str, Sequence[str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    chunksize: Optional[int] = None,
+) -> Union["pandas.DataFrame", Iterator["pandas.DataFrame"]]:
+    """
+    Like ``pandas.read_sql``, with the DataFrame built by DuckDB
+
+    :param sql: a table name, SQL string, or SQLAlchemy selectable
+    :param chunksize: if given, an iterator of DataFrames of this many rows is
+        returned instead, which keeps the connection until it is exhausted
+    """
+    if chunksize is not None:
+        if chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        return _read_chunks(sql, con, index_col, params, chunksize)
+
+    if isinstance(con, Engine):
+        with con.connect() as conn:
+            return read_sql(sql, conn, index_col, params)
+
+    result = con.execute(_statement(sql, con), params or {})
+    try:
+        frame = _cursor(result).fetch_df()
+    finally:
+        result.close()
+    return _set_index(frame, index_col)
+
+
+def _read_chunks(
+    sql: Any,
+    con: Union[Engine, Connection],
+    index_col: Union[None, str, Sequence[str]],
+    params: Optional[Dict[str, Any]],
+    chunksize: int,
+) -> Iterator["pandas.DataFrame"]:
+    import pandas
+
+    if isinstance(con, Engine):
+        with con.connect() as conn:
+            yield from _read_chunks(sql, conn, index_col, params, chunksize)
+        return
+
+    result = con.execute(_statement(sql, con), params or {})
+    try:
+        cursor = _cursor(result)
+        vectors = -(-chunksize // VECTOR_SIZE)
+        pending = None
+        while True:
+            frame = cursor.fetch_df_chunk(vectors)
+            if not len(frame):
+                break
+            if pending is not None:
+                frame = pandas.concat([pending, frame], ignore_index=True)
+            while len(frame) >= chunksize:
+                yield _set_index(frame.iloc[:chunksize], index_col)
+                frame = frame.iloc[chunksize:].reset_index(drop=True)
+            pending = frame if len(frame) else None
+        if pending is not None:
+            yield _set_index(pending, index_col)
+    finally:
+        result.close()
+
+
+def _statement(sql: Any, conn: Connection) -> Any:
+    if not isinstance(sql, str):
+        return sql
+    if inspect(conn).has_table(sql):
+        preparer = conn.dialect.identifier_preparer
+        return text(f"SELECT * FROM {preparer.quote(sql)}")
+    return text(sql)
+
+
+def _set_index(
+    frame: "pandas.DataFrame", index_col: Union[None, str, Sequence[str]]
+) -> "pandas.DataFrame":
+    if index_col is None:
+        return frame
+    keys = [index_col] if isinstance(index_col, str) else list(index_col)
+    return frame.set_index(keys)
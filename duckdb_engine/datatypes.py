@@ -7,12 +7,14 @@ select * from duckdb_types where type_category = 'NUMERIC';
 ```
 """
 
+import re
 import typing
-from typing import Any, Callable, Dict, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 import duckdb
 from packaging.version import Version
-from sqlalchemy import exc
+from sqlalchemy import exc, util
+from sqlalchemy.dialects.postgresql import BYTEA
 from sqlalchemy.dialects.postgresql.base import PGIdentifierPreparer, PGTypeCompiler
 from sqlalchemy.engine import Dialect
 from sqlalchemy.ext.compiler import compiles
@@ -109,6 +111,65 @@ assert types
 TV = typing.Union[Type[TypeEngine], TypeEngine]
 
 
+def type_cache_key(value: TV) -> Any:
+    """
+    Cache key for a nested type, so that eg ``String`` and ``String()`` share one
+    """
+    return type_api.to_instance(value)._static_cache_key
+
+
+def fields_cache_key(fields: Optional[Dict[str, TV]]) -> Any:
+    if fields is None:
+        return None
+    return tuple((name, type_cache_key(value)) for name, value in fields.items())
+
+
+_Processor = Callable[[Any], Any]
+
+
+def nested_result_processor(value: TV, dialect: Dialect) -> Optional[_Processor]:
+    """
+    The result processor of a type nested in a Struct or Map, None when
+    DuckDB's value can be used as is
+    """
+    return type_api.to_instance(value)._cached_result_processor(dialect, None)
+
+
+def nested_bind_processor(value: TV, dialect: Dialect) -> Optional[_Processor]:
+    """
+    The bind processor of a type nested in a Struct or Map, None when values
+    can be bound as is
+    """
+    return type_api.to_instance(value)._cached_bind_processor(dialect)
+
+
+def _fields_processor(
+    processors: Dict[str, Optional[_Processor]],
+) -> Optional[Callable[[Optional[dict]], Optional[dict]]]:
+    """
+    Applies the processors of a struct's fields to its values, None when none
+    of its fields need processing
+    """
+    fields = {name: p for name, p in processors.items() if p is not None}
+    if not fields:
+        return None
+
+    def process(value: Optional[dict]) -> Optional[dict]:
+        if value is None:
+            return None
+        value = dict(value)
+        for name, processor in fields.items():
+            if name in value:
+                value[name] = processor(value[name])
+        return value
+
+    return process
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
 class Struct(TypeEngine):
     """
     Represents a STRUCT type in DuckDB
@@ -131,6 +192,33 @@ class Struct(TypeEngine):
     def __init__(self, fields: Optional[Dict[str, TV]] = None):
         self.fields = fields
 
+    @util.memoized_property
+    def _static_cache_key(self) -> Any:
+        # the default implementation would embed the (unhashable) fields dict
+        return (self.__class__, ("fields", fields_cache_key(self.fields)))
+
+    def bind_processor(
+        self, dialect: Dialect
+    ) -> Optional[Callable[[Optional[dict]], Optional[dict]]]:
+        return _fields_processor(
+            {
+                name: nested_bind_processor(value, dialect)
+                for name, value in (self.fields or {}).items()
+            }
+        )
+
+    def result_processor(
+        self, dialect: Dialect, coltype: str
+    ) -> Optional[Callable[[Optional[dict]], Optional[dict]]]:
+        # DuckDB already returns structs as dicts, so only fields whose types
+        # process their values (such as JSON) need a processor
+        return _fields_processor(
+            {
+                name: nested_result_processor(value, dialect)
+                for name, value in (self.fields or {}).items()
+            }
+        )
+
 
 class Map(TypeEngine):
     """
@@ -155,23 +243,64 @@ class Map(TypeEngine):
         self.key_type = key_type
         self.value_type = value_type
 
+    @util.memoized_property
+    def _static_cache_key(self) -> Any:
+        return (
+            self.__class__,
+            ("key_type", type_cache_key(self.key_type)),
+            ("value_type", type_cache_key(self.value_type)),
+        )
+
     def bind_processor(
         self, dialect: Dialect
     ) -> Optional[Callable[[Optional[dict]], Optional[dict]]]:
+        key_processor = nested_bind_processor(self.key_type, dialect)
+        value_processor = nested_bind_processor(self.value_type, dialect)
+        if key_processor is None and value_processor is None:
+            return lambda value: (
+                {"key": list(value), "value": list(value.values())} if value else None
+            )
+
+        process_key = key_processor or _identity
+        process_value = value_processor or _identity
         return lambda value: (
-            {"key": list(value), "value": list(value.values())} if value else None
+            {
+                "key": [process_key(key) for key in value],
+                "value": [process_value(item) for item in value.values()],
+            }
+            if value
+            else None
         )
 
     def result_processor(
         self, dialect: Dialect, coltype: str
     ) -> Optional[Callable[[Optional[dict]], Optional[dict]]]:
-        if IS_GT_1:
-            return lambda value: value
-        else:
+        key_processor = nested_result_processor(self.key_type, dialect)
+        value_processor = nested_result_processor(self.value_type, dialect)
+        if key_processor is None and value_processor is None:
+            if IS_GT_1:
+                # DuckDB already returns maps as dicts
+                return None
             return (
                 lambda value: dict(zip(value["key"], value["value"])) if value else {}
             )
 
+        process_key = key_processor or _identity
+        process_value = value_processor or _identity
+
+        def process(value: Optional[dict]) -> Optional[dict]:
+            if IS_GT_1:
+                if value is None:
+                    return None
+                items: typing.Iterable = value.items()
+            elif not value:
+                return {}
+            else:
+                items = zip(value["key"], value["value"])
+            return {process_key(k): process_value(v) for k, v in items}
+
+        return process
+
 
 class Union(TypeEngine):
     """
@@ -194,6 +323,10 @@ class Union(TypeEngine):
     def __init__(self, fields: Dict[str, TV]):
         self.fields = fields
 
+    @util.memoized_property
+    def _static_cache_key(self) -> Any:
+        return (self.__class__, ("fields", fields_cache_key(self.fields)))
+
 
 ISCHEMA_NAMES = {
     "hugeint": HugeInteger,
@@ -216,6 +349,10 @@ ISCHEMA_NAMES = {
     "enum": sqltypes.Enum,
     "bool": sqltypes.BOOLEAN,
     "varchar": String,
+    # names as spelt by duckdb_columns()
+    "double": sqltypes.FLOAT,
+    "decimal": sqltypes.NUMERIC,
+    "blob": BYTEA,
 }
 if IS_GT_1:
     ISCHEMA_NAMES["varint"] = VarInt
@@ -282,3 +419,127 @@ def visit_map(instance: Map, compiler: PGTypeCompiler, **kw: Any) -> str:
         process_type(instance.key_type, compiler, **kw),
         process_type(instance.value_type, compiler, **kw),
     )
+
+
+_TYPE_TOKEN_RE = re.compile(r"""\s*("(?:[^"]|"")*"|'(?:[^']|'')*'|[\w.]+|[(),\[\]])""")
+
+
+class _TypeParser:
+    """
+    Parses the ``data_type`` strings of ``duckdb_columns()``, such as
+    ``STRUCT(a INTEGER, "b c" VARCHAR[])[3]``, into SQLAlchemy types
+    """
+
+    def __init__(
+        self,
+        data_type: str,
+        ischema_names: Dict[str, Type[TypeEngine]],
+        enum_names: Dict[Tuple[str, ...], str],
+    ) -> None:
+        self.tokens = _TYPE_TOKEN_RE.findall(data_type)
+        self.position = 0
+        self.ischema_names = ischema_names
+        self.enum_names = enum_names
+
+    def peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("unexpected end of type")
+        self.position += 1
+        return token
+
+    def expect(self, token: str) -> None:
+        if self.next() != token:
+            raise ValueError(f"expected {token!r}")
+
+    def parse(self) -> TypeEngine:
+        result = self.parse_type()
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek()!r}")
+        return result
+
+    def parse_type(self) -> TypeEngine:
+        words = [self.next()]
+        while (self.peek() or "(").isidentifier():
+            words.append(self.next())
+        name = " ".join(words).lower()
+
+        if name in ("struct", "union"):
+            fields = self.parse_fields()
+            result: TypeEngine = Struct(fields) if name == "struct" else Union(fields)
+        elif name == "map":
+            self.expect("(")
+            key_type = self.parse_type()
+            self.expect(",")
+            value_type = self.parse_type()
+            self.expect(")")
+            result = Map(key_type, value_type)
+        elif name == "enum":
+            labels = tuple(
+                label[1:-1].replace("''", "'") for label in self.parse_arguments()
+            )
+            result = sqltypes.Enum(*labels, name=self.enum_names.get(labels))
+        else:
+            arguments = self.parse_arguments() if self.peek() == "(" else []
+            result = self.lookup(name, [int(arg) for arg in arguments])
+
+        dimensions = 0
+        while self.peek() == "[":
+            self.next()
+            if self.next() != "]":
+                self.expect("]")
+            dimensions += 1
+        if dimensions:
+            result = sqltypes.ARRAY(result, dimensions=dimensions)
+        return result
+
+    def parse_fields(self) -> Dict[str, TV]:
+        fields: Dict[str, TV] = {}
+        self.expect("(")
+        while True:
+            name = self.next()
+            if name.startswith('"'):
+                name = name[1:-1].replace('""', '"')
+            fields[name] = self.parse_type()
+            if self.next() == ")":
+                return fields
+
+    def parse_arguments(self) -> List[str]:
+        arguments = []
+        self.expect("(")
+        while True:
+            arguments.append(self.next())
+            if self.next() == ")":
+                return arguments
+
+    def lookup(self, name: str, arguments: List[int]) -> TypeEngine:
+        timezone = name.endswith(" with time zone")
+        type_cls = self.ischema_names.get(name)
+        if type_cls is None:
+            raise KeyError(name)
+        if timezone and issubclass(type_cls, (sqltypes.TIMESTAMP, sqltypes.TIME)):
+            return type_cls(timezone=True)
+        return type_cls(*arguments)
+
+
+def parse_type(
+    data_type: str,
+    ischema_names: Dict[str, Type[TypeEngine]],
+    enum_names: Optional[Dict[Tuple[str, ...], str]] = None,
+) -> TypeEngine:
+    """
+    Convert a DuckDB type name, as found in ``duckdb_columns().data_type``, into
+    a SQLAlchemy type
+
+    Raises ``KeyError`` for (possibly nested) types missing from
+    ``ischema_names``, and ``ValueError`` for names that can't be parsed
+
+    :param enum_names: names of the ``ENUM`` types defined in the database, by
+        their labels, as columns report the labels rather than the type name
+    """
+    return _TypeParser(data_type, ischema_names, enum_names or {}).parse()
@@ -0,0 +1,135 @@
+"""
+Opt-in per statement timing and result sizes
+
+```python
+from duckdb_engine import QueryStats
+
+stats = QueryStats()
+engine = create_engine("duckdb:///file.db", connect_args={"instrumentation": stats})
+
+...
+
+for sql, totals in stats.snapshot().items():
+    print(sql, totals["count"], totals["execute_time"])
+```
+
+Connections given an ``Instrumentation`` hand out cursors that report to it
+as statements are executed and their results fetched. Connections without
+one are not affected at all.
+"""
+
+import re
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Sequence
+
+ROWS_SIZE_SAMPLE = 100
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# string and number literals, leaving quoted identifiers and $n parameters be
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|(?<![\w$])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """
+    ``statement`` with its literals replaced by ``?`` and whitespace collapsed,
+    so that statements differing only by literal values are counted together
+    """
+    statement = _LITERAL_RE.sub("?", statement)
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+def rows_size(rows: Sequence[Sequence[Any]]) -> int:
+    """
+    Approximate size of fetched rows, the shallow size of their values, as
+    measured on up to ``ROWS_SIZE_SAMPLE`` rows spread through them
+    """
+    if not rows:
+        return 0
+    sample = rows[:: max(1, len(rows) // ROWS_SIZE_SAMPLE)]
+    getsizeof = sys.getsizeof
+    size = sum(getsizeof(value) for row in sample for value in row)
+    return size * len(rows) // len(sample)
+
+
+class Instrumentation:
+    """
+    Receives measurements of each statement, all times are in seconds
+
+    Subclass this to export measurements as they are taken.
+    """
+
+    def on_execute(self, statement: str, latency: float, duration: float) -> None:
+        """
+        :param latency: from the cursor being created, after SQLAlchemy compiled
+            the statement (or found it in its cache), until DuckDB was called,
+            which is mostly parameter processing
+        :param duration: DuckDB's execution of the statement
+        """
+
+    def on_fetch(self, statement: str, rows: int, nbytes: int, duration: float) -> None:
+        """
+        :param rows: number of rows fetched, or for Arrow and DataFrame
+            results, the number of rows in the fetched table
+        :param nbytes: size of the fetched rows, see ``rows_size``, or of the
+            Arrow table or DataFrame
+        """
+
+
+class QueryStats(Instrumentation):
+    """
+    Totals per normalized statement, safe to share between connections
+    """
+
+    FIELDS = (
+        "count",
+        "latency",
+        "execute_time",
+        "max_execute_time",
+        "fetch_time",
+        "rows",
+        "bytes",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, statement: str) -> Dict[str, float]:
+        key = normalize_sql(statement)
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = dict.fromkeys(self.FIELDS, 0)
+        return entry
+
+    def on_execute(self, statement: str, latency: float, duration: float) -> None:
+        with self._lock:
+            entry = self._entry(statement)
+            entry["count"] += 1
+            entry["latency"] += latency
+            entry["execute_time"] += duration
+            entry["max_execute_time"] = max(entry["max_execute_time"], duration)
+
+    def on_fetch(self, statement: str, rows: int, nbytes: int, duration: float) -> None:
+        with self._lock:
+            entry = self._entry(statement)
+            entry["fetch_time"] += duration
+            entry["rows"] += rows
+            entry["bytes"] += nbytes
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        A copy of the totals, keyed by normalized statement
+        """
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._stats.items()}
+
+    def reset(self) -> Dict[str, Dict[str, float]]:
+        """
+        Clear the totals, returning them as ``snapshot()`` would have
+        """
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return stats
@@ -0,0 +1,157 @@
+"""
+DuckDB's file reading table functions as typed SQLAlchemy tables
+
+```python
+from duckdb_engine import read_parquet
+
+events = read_parquet(
+    "events/*/*.parquet",
+    columns={"id": Integer, "kind": String, "year": Integer},
+    hive_partitioning=True,
+)
+
+query = select(events.c.id).where(events.c.kind == "click", events.c.year == 2024)
+```
+
+As the columns are known, Core and ORM queries can select and filter on them
+like any table, and DuckDB pushes the projection and filters into the scan,
+reading only the columns (and for Parquet, row groups and partitions) needed.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+from sqlalchemy import column, exc
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import type_api
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import TableClause
+
+from .copy import _OPTION_RE, render_string
+from .datatypes import TV
+
+Paths = Union[str, Sequence[str]]
+
+
+def render_value(value: Any) -> str:
+    """
+    ``value`` as a DuckDB literal, lists become lists and dicts structs
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, (int, float)):
+        return repr(value)
+    elif isinstance(value, str):
+        return render_string(value)
+    elif isinstance(value, (list, tuple)):
+        return "[{}]".format(", ".join(render_value(v) for v in value))
+    elif isinstance(value, dict):
+        return "{{{}}}".format(
+            ", ".join(
+                f"{render_string(str(k))}: {render_value(v)}" for k, v in value.items()
+            )
+        )
+    raise exc.CompileError(f"Unsupported argument {value!r}")
+
+
+class FileScan(TableClause):
+    """
+    A table read from files by one of DuckDB's table functions, such as
+    ``read_parquet``, with the columns it was declared with
+
+    Use ``name`` (or ``.alias()``) to tell scans apart when joining them.
+    With ``typed``, the columns' types are also passed to the function as its
+    ``columns`` argument.
+    """
+
+    inherit_cache = False
+
+    def __init__(
+        self,
+        function: str,
+        path: Paths,
+        columns: Mapping[str, TV],
+        name: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        typed: bool = False,
+    ) -> None:
+        super().__init__(
+            name or function,
+            *(
+                column(key, type_api.to_instance(type_))
+                for key, type_ in columns.items()
+            ),
+        )
+        self.function = function
+        self.path = path if isinstance(path, str) else list(path)
+        self.scan_options = dict(options or {})
+        self.typed = typed
+
+
+@compiles(FileScan, "duckdb")  # type: ignore[misc]
+def visit_file_scan(
+    element: FileScan, compiler: SQLCompiler, asfrom: bool = False, **kw: Any
+) -> str:
+    arguments = [render_value(element.path)]
+    if element.typed:
+        types = {
+            col.name: compiler.dialect.type_compiler.process(col.type)
+            for col in element.columns
+        }
+        arguments.append(f"columns = {render_value(types)}")
+    for name, value in element.scan_options.items():
+        if not _OPTION_RE.match(name):
+            raise exc.CompileError(f"Invalid option name {name!r}")
+        arguments.append(f"{name} = {render_value(value)}")
+    call = "{}({})".format(element.function, ", ".join(arguments))
+    if asfrom and kw.get("enclosing_alias") is None:
+        return f"{call} AS {compiler.preparer.quote(element.name)}"
+    return call
+
+
+def read_parquet(
+    path: Paths,
+    columns: Mapping[str, TV],
+    name: Optional[str] = None,
+    **options: Any,
+) -> FileScan:
+    """
+    ``read_parquet(path, ...)`` with the given columns
+
+    :param path: a file, glob or URL, or a list of them
+    :param columns: the names and types of the columns to query, which may
+        be fewer than the files have
+    :param options: arguments of ``read_parquet``, eg ``hive_partitioning=True``
+    """
+    return FileScan("read_parquet", path, columns, name, options)
+
+
+def read_csv(
+    path: Paths,
+    columns: Mapping[str, TV],
+    name: Optional[str] = None,
+    **options: Any,
+) -> FileScan:
+    """
+    ``read_csv(path, ...)`` with the given columns
+
+    :param columns: the names and types of the columns of the files, in order,
+        which DuckDB reads them as rather than detecting their types
+    :param options: arguments of ``read_csv``, eg ``header=True``
+    """
+    return FileScan("read_csv", path, columns, name, options, typed=True)
+
+
+def read_json(
+    path: Paths,
+    columns: Mapping[str, TV],
+    name: Optional[str] = None,
+    **options: Any,
+) -> FileScan:
+    """
+    ``read_json(path, ...)`` with the given columns
+
+    :param columns: the names and types of the keys to read, which DuckDB
+        reads them as rather than detecting their types
+    :param options: arguments of ``read_json``, eg ``format="newline_delimited"``
+    """
+    return FileScan("read_json", path, columns, name, options, typed=True)
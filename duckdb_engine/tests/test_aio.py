@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+from pytest import importorskip
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.dialects import registry  # type: ignore
+
+importorskip("greenlet")
+asyncio_ext = importorskip("sqlalchemy.ext.asyncio")
+
+metadata = MetaData()
+users = Table("users", metadata, Column("id", Integer), Column("name", String))
+
+
+def test_async_engine(tmp_path: Path) -> None:
+    registry.register("duckdb.async", "duckdb_engine.aio", "AsyncDialect")
+
+    async def run() -> None:
+        engine = asyncio_ext.create_async_engine(f"duckdb+async:///{tmp_path}/a.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(
+                insert(users), [{"id": i, "name": f"user {i}"} for i in range(3)]
+            )
+
+        async with asyncio_ext.AsyncSession(engine) as session:
+            result = await session.execute(select(users.c.name).order_by(users.c.id))
+            assert result.scalars().all() == ["user 0", "user 1", "user 2"]
+
+        async with engine.connect() as conn:
+            stream = await conn.stream(text("select * from range(5)"))
+            assert [row async for row in stream] == [(i,) for i in range(5)]
+
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_async_engine_does_not_block() -> None:
+    registry.register("duckdb.async", "duckdb_engine.aio", "AsyncDialect")
+
+    async def run() -> None:
+        engine = asyncio_ext.create_async_engine("duckdb+async:///:memory:")
+        ticks: List[None] = []
+
+        async def tick() -> None:
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.ensure_future(tick())
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text("select count(*) from range(100000000) t(i) where i % 7 = 0")
+            )
+            assert result.scalar() == 14285715
+        ticker.cancel()
+        await engine.dispose()
+        # the loop kept running while the query did
+        assert len(ticks) > 1
+
+    asyncio.run(run())
+
+
+def test_async_engine_dispose_stops_threads() -> None:
+    registry.register("duckdb.async", "duckdb_engine.aio", "AsyncDialect")
+
+    async def run() -> None:
+        engine = asyncio_ext.create_async_engine("duckdb+async:///:memory:")
+        dialect = engine.sync_engine.dialect
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("select 1"))).scalar() == 1
+        executor = dialect._executor()
+
+        await engine.dispose()
+        assert executor._shutdown
+
+        # the engine can still be used after being disposed
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("select 2"))).scalar() == 2
+        await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,576 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Tuple
+from uuid import uuid4
+
+import duckdb
+from pytest import MonkeyPatch, importorskip, mark
+from pytest_benchmark.fixture import BenchmarkFixture
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    inspect,
+    pool,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+from .. import (
+    CopyFrom,
+    CopyTo,
+    QueryStats,
+    _bulk,
+    insert_dataframe,
+    read_parquet,
+    read_sql,
+)
+from ..datatypes import Map, Struct
+from .util import sqlalchemy_1_only
+
+ROWS = 2_000
+TABLES = 1_000
+
+# benchmarks named *_duckdb are baselines, doing the same work with duckdb alone
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String)
+    value = Column(Float)
+
+
+# the DDL SQLAlchemy emits for Item, for the baselines
+ITEMS_DDL = (
+    "create or replace table items "
+    "(id integer not null primary key, name varchar, value float)"
+)
+
+
+def test_orm_insert(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "orm_insert"
+    engine = create_engine("duckdb:///:memory:")
+    Session = sessionmaker(bind=engine)
+
+    def setup() -> Tuple[Tuple[Any], dict]:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        return (Session(),), {}
+
+    def insert(session: Any) -> None:
+        session.add_all(
+            [Item(id=i, name=f"name {i}", value=i / 2) for i in range(ROWS)]
+        )
+        session.commit()
+        session.close()
+
+    benchmark.pedantic(insert, setup=setup, rounds=3, warmup_rounds=1)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("select count(*) from items")).scalar() == ROWS
+
+
+def test_orm_insert_duckdb(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "orm_insert"
+    conn = duckdb.connect()
+    rows = [(i, f"name {i}", i / 2) for i in range(ROWS)]
+
+    def setup() -> None:
+        conn.execute(ITEMS_DDL)
+
+    benchmark.pedantic(
+        conn.executemany,
+        args=("insert into items values (?, ?, ?)", rows),
+        setup=setup,
+        rounds=3,
+        warmup_rounds=1,
+    )
+
+
+def test_orm_select(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "orm_select"
+    engine = create_engine("duckdb:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "insert into items select range, 'name ' || range, range / 2 "
+                f"from range({ROWS * 10})"
+            )
+        )
+    Session = sessionmaker(bind=engine)
+
+    def select_all() -> list:
+        session = Session()
+        try:
+            return session.query(Item).all()
+        finally:
+            session.close()
+
+    items = benchmark(select_all)
+    assert len(items) == ROWS * 10
+
+
+def test_orm_select_duckdb(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "orm_select"
+    conn = duckdb.connect()
+    conn.execute(
+        "create table items as select range as id, 'name ' || range as name, "
+        f"range / 2 as value from range({ROWS * 10})"
+    )
+
+    rows = benchmark(
+        lambda: conn.execute("select id, name, value from items").fetchall()
+    )
+    assert len(rows) == ROWS * 10
+
+
+@mark.parametrize("columnar", [True, False], ids=["columnar", "per_row"])
+def test_executemany_insert(
+    benchmark: BenchmarkFixture, monkeypatch: MonkeyPatch, columnar: bool
+) -> None:
+    importorskip("pyarrow")
+    if not columnar:
+        monkeypatch.setattr(_bulk, "BULK_INSERT_THRESHOLD", ROWS + 1)
+
+    benchmark.group = "executemany"
+    engine = create_engine("duckdb:///:memory:")
+    rows = [(i, f"name {i}", i / 2) for i in range(ROWS)]
+
+    def setup() -> Tuple[Tuple[Callable[[str, list], None]], dict]:
+        conn = engine.raw_connection()
+        conn.cursor().execute("create or replace table bench (i int, s text, f double)")
+        return (conn.cursor().executemany,), {}
+
+    def insert(executemany: Callable[[str, list], None]) -> None:
+        executemany("INSERT INTO bench (i, s, f) VALUES (?, ?, ?)", rows)
+
+    benchmark.pedantic(insert, setup=setup, rounds=3, warmup_rounds=1)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("select count(*) from bench")).scalar() == ROWS
+
+
+def test_executemany_insert_duckdb(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "executemany"
+    conn = duckdb.connect()
+    rows = [(i, f"name {i}", i / 2) for i in range(ROWS)]
+
+    def setup() -> None:
+        conn.execute("create or replace table bench (i int, s text, f double)")
+
+    benchmark.pedantic(
+        conn.executemany,
+        args=("INSERT INTO bench (i, s, f) VALUES (?, ?, ?)", rows),
+        setup=setup,
+        rounds=3,
+        warmup_rounds=1,
+    )
+
+
+@mark.parametrize("columns", [1, 500], ids=["short", "long"])
+def test_execute(benchmark: BenchmarkFixture, columns: int) -> None:
+    benchmark.group = "execute"
+    engine = create_engine("duckdb:///:memory:")
+    cursor = engine.raw_connection().cursor()
+    statement = "select " + ", ".join(f"{i} as c{i}" for i in range(columns))
+
+    benchmark(cursor.execute, statement)
+
+
+@mark.parametrize("columns", [1, 500], ids=["short", "long"])
+def test_execute_duckdb(benchmark: BenchmarkFixture, columns: int) -> None:
+    benchmark.group = "execute"
+    conn = duckdb.connect()
+    statement = "select " + ", ".join(f"{i} as c{i}" for i in range(columns))
+
+    benchmark(conn.execute, statement)
+
+
+@mark.parametrize("module", ["duckdb_engine", "duckdb"])
+def test_import_time(benchmark: BenchmarkFixture, module: str) -> None:
+    benchmark.group = "import"
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", f"import {module}"],),
+        kwargs={"check": True},
+        rounds=3,
+    )
+
+
+def _create_tables(execute: Callable[[str], Any]) -> None:
+    for i in range(TABLES):
+        execute(
+            f"create table t{i} (id int, name text, value decimal(10, 2), "
+            "tags varchar[], attrs struct(a int, b text))"
+        )
+
+
+def test_reflect_columns(benchmark: BenchmarkFixture) -> None:
+    importorskip("sqlalchemy", "2.0.0")
+    benchmark.group = "reflection"
+    engine = create_engine("duckdb:///:memory:")
+    with engine.begin() as conn:
+        _create_tables(conn.exec_driver_sql)
+
+    columns = benchmark.pedantic(
+        lambda: inspect(engine).get_multi_columns(), rounds=3, warmup_rounds=1
+    )
+    assert len(columns) == TABLES
+
+
+def test_reflect_columns_duckdb(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "reflection"
+    conn = duckdb.connect()
+    _create_tables(conn.execute)
+
+    columns = benchmark.pedantic(
+        lambda: conn.execute(
+            "select table_name, column_name, data_type, is_nullable, column_default "
+            "from duckdb_columns() where not internal "
+            "order by table_name, column_index"
+        ).fetchall(),
+        rounds=3,
+        warmup_rounds=1,
+    )
+    assert len(columns) == TABLES * 5
+
+
+@mark.parametrize("size", [0, 16], ids=["unprepared", "prepared"])
+def test_prepared_statement_cache(benchmark: BenchmarkFixture, size: int) -> None:
+    benchmark.group = "prepared"
+    engine = create_engine(
+        "duckdb:///:memory:", connect_args={"prepared_statement_cache_size": size}
+    )
+    with engine.begin() as conn:
+        conn.execute(text("create table bench as select range as i from range(1000)"))
+    query = text(
+        "select b.i, count(*) from bench as a join bench as b on a.i = b.i "
+        "where a.i between :low and :high group by b.i order by b.i"
+    )
+
+    with engine.connect() as conn:
+        rows = benchmark(
+            lambda: conn.execute(query, {"low": 10, "high": 20}).fetchall()
+        )
+    assert len(rows) == 11
+
+
+@mark.parametrize("size", [0, 1 << 24], ids=["uncached", "cached"])
+def test_result_cache(benchmark: BenchmarkFixture, tmp_path: Path, size: int) -> None:
+    importorskip("pyarrow")
+    benchmark.group = "result_cache"
+    path = tmp_path / "bench.db"
+    with duckdb.connect(str(path)) as conn:
+        conn.execute(
+            f"create table bench as select range % 100 as k, range as v from range({ROWS * 1000})"
+        )
+
+    engine = create_engine(
+        f"duckdb:///{path}",
+        connect_args={"read_only": True, "result_cache_size": size},
+    )
+    query = text("select k, sum(v) from bench where v > :v group by k order by k")
+    with engine.connect() as conn:
+        rows = benchmark(lambda: conn.execute(query, {"v": 10}).fetchall())
+    assert len(rows) == 100
+
+
+@sqlalchemy_1_only
+@mark.parametrize("registered", [True, False], ids=["insert_dataframe", "default"])
+def test_to_sql(benchmark: BenchmarkFixture, registered: bool) -> None:
+    pd = importorskip("pandas")
+    importorskip("pyarrow")
+    benchmark.group = "to_sql"
+    engine = create_engine("duckdb:///:memory:")
+    df = pd.DataFrame(
+        {"i": range(ROWS * 50), "s": [f"name {i}" for i in range(ROWS * 50)]}
+    )
+    method = insert_dataframe() if registered else None
+
+    benchmark.pedantic(
+        df.to_sql,
+        args=("frame", engine),
+        kwargs={"if_exists": "replace", "index": False, "method": method},
+        rounds=3,
+        warmup_rounds=1,
+    )
+
+    with engine.connect() as conn:
+        assert conn.execute(text("select count(*) from frame")).scalar() == len(df)
+
+
+@sqlalchemy_1_only
+@mark.parametrize("fetchdf", [True, False], ids=["duckdb_engine", "pandas"])
+def test_read_sql(benchmark: BenchmarkFixture, fetchdf: bool) -> None:
+    pd = importorskip("pandas")
+    benchmark.group = "read_sql"
+    engine = create_engine("duckdb:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"create table frame as select range as i, 'name ' || range as s, "
+                f"range / 2 as f from range({ROWS * 100})"
+            )
+        )
+    reader = read_sql if fetchdf else pd.read_sql
+
+    frame = benchmark.pedantic(
+        reader, args=("select * from frame", engine), rounds=3, warmup_rounds=1
+    )
+    assert len(frame) == ROWS * 100
+
+
+def test_connect(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "connect"
+    engine = create_engine(
+        f"duckdb:///{tmp_path}/connect.db",
+        poolclass=pool.NullPool,
+        connect_args={"preload_extensions": ["json", "parquet"]},
+    )
+    engine.raw_connection().close()
+
+    benchmark(lambda: engine.raw_connection().close())
+
+
+def test_connect_duckdb(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "connect"
+    path = str(tmp_path / "connect.db")
+    duckdb.connect(path).close()
+
+    def connect() -> None:
+        conn = duckdb.connect(path)
+        conn.execute("LOAD json; LOAD parquet")
+        conn.close()
+
+    benchmark(connect)
+
+
+@mark.parametrize("instrumented", [False, True], ids=["off", "on"])
+def test_instrumentation(benchmark: BenchmarkFixture, instrumented: bool) -> None:
+    benchmark.group = "instrumentation"
+    connect_args = {"instrumentation": QueryStats()} if instrumented else {}
+    engine = create_engine("duckdb:///:memory:", connect_args=connect_args)
+    query = text(f"select range as i, 'name ' || range as s from range({ROWS})")
+
+    with engine.connect() as conn:
+        rows = benchmark(lambda: conn.execute(query).fetchall())
+    assert len(rows) == ROWS
+
+
+def _nested_table() -> Table:
+    return Table(
+        "nested",
+        MetaData(),
+        Column("struct", Struct({"name": String, "value": Integer})),
+        Column("map", Map(String, Integer)),
+        Column("list", ARRAY(Integer)),
+    )
+
+
+def test_insert_nested(benchmark: BenchmarkFixture) -> None:
+    importorskip("pyarrow")
+    benchmark.group = "nested"
+    engine = create_engine("duckdb:///:memory:")
+    nested = _nested_table()
+    rows = [
+        {
+            "struct": {"name": f"name {i}", "value": i},
+            "map": {"key": i},
+            "list": [i, i + 1],
+        }
+        for i in range(ROWS)
+    ]
+
+    def setup() -> None:
+        with engine.begin() as conn:
+            nested.drop(conn, checkfirst=True)
+            nested.create(conn)
+
+    def insert() -> None:
+        with engine.begin() as conn:
+            conn.execute(nested.insert(), rows)
+
+    benchmark.pedantic(insert, setup=setup, rounds=3, warmup_rounds=1)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(nested)).scalar() == ROWS
+
+
+def test_insert_uuid(benchmark: BenchmarkFixture) -> None:
+    # UUIDs aren't inserted as a columnar batch, so this measures the fallback
+    benchmark.group = "insert_fallback"
+    engine = create_engine("duckdb:///:memory:")
+    uuids = Table(
+        "uuids",
+        MetaData(),
+        Column("id", Integer),
+        Column("uuid", UUID(as_uuid=True)),
+    )
+    rows = [{"id": i, "uuid": uuid4()} for i in range(ROWS * 5)]
+
+    def setup() -> None:
+        with engine.begin() as conn:
+            uuids.drop(conn, checkfirst=True)
+            uuids.create(conn)
+
+    def insert() -> None:
+        with engine.begin() as conn:
+            conn.execute(uuids.insert(), rows)
+
+    benchmark.pedantic(insert, setup=setup, rounds=3, warmup_rounds=1)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(uuids)).scalar() == len(
+            rows
+        )
+
+
+def test_fetch_nested(benchmark: BenchmarkFixture) -> None:
+    benchmark.group = "nested"
+    engine = create_engine("duckdb:///:memory:")
+    nested = _nested_table()
+    with engine.begin() as conn:
+        nested.create(conn)
+        conn.execute(
+            text(
+                "insert into nested select {'name': 'name ' || range, 'value': range}, "
+                f"map {{'key': range}}, [range] from range({ROWS * 10})"
+            )
+        )
+
+    with engine.connect() as conn:
+        rows = benchmark(lambda: conn.execute(select(nested)).fetchall())
+    assert len(rows) == ROWS * 10
+
+
+def test_copy_from(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "copy_from"
+    path = str(tmp_path / "items.parquet")
+    duckdb.connect().execute(
+        "copy (select range as id, 'name ' || range as name, range / 2 as value "
+        f"from range({ROWS * 100})) to '{path}'"
+    )
+    engine = create_engine("duckdb:///:memory:")
+
+    def setup() -> None:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+
+    def copy() -> Any:
+        with engine.begin() as conn:
+            return conn.execute(CopyFrom(Item.__table__, path)).scalar()
+
+    loaded = benchmark.pedantic(copy, setup=setup, rounds=3, warmup_rounds=1)
+    assert loaded == ROWS * 100
+
+
+def test_copy_from_duckdb(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "copy_from"
+    path = str(tmp_path / "items.parquet")
+    conn = duckdb.connect()
+    conn.execute(
+        "copy (select range as id, 'name ' || range as name, range / 2 as value "
+        f"from range({ROWS * 100})) to '{path}'"
+    )
+
+    def setup() -> None:
+        conn.execute(ITEMS_DDL)
+
+    benchmark.pedantic(
+        conn.execute,
+        args=(f"copy items from '{path}'",),
+        setup=setup,
+        rounds=3,
+        warmup_rounds=1,
+    )
+
+
+def test_copy_to(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "copy_to"
+    engine = create_engine("duckdb:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "insert into items select range, 'name ' || range, range / 2 "
+                f"from range({ROWS * 100})"
+            )
+        )
+    query = select(Item.__table__).where(Item.value >= 0)
+    path = str(tmp_path / "items.parquet")
+
+    def copy() -> Any:
+        with engine.connect() as conn:
+            return conn.execute(CopyTo(query, path)).scalar()
+
+    written = benchmark.pedantic(copy, rounds=3, warmup_rounds=1)
+    assert written == ROWS * 100
+
+
+def test_copy_to_duckdb(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "copy_to"
+    conn = duckdb.connect()
+    conn.execute(ITEMS_DDL)
+    conn.execute(
+        "insert into items select range, 'name ' || range, range / 2 "
+        f"from range({ROWS * 100})"
+    )
+    path = str(tmp_path / "items.parquet")
+
+    benchmark.pedantic(
+        conn.execute,
+        args=(
+            f"copy (select * from items where value >= 0) to '{path}' (format parquet)",
+        ),
+        rounds=3,
+        warmup_rounds=1,
+    )
+
+
+def _write_events(path: Path) -> None:
+    duckdb.connect().execute(
+        "copy (select range as id, 'kind ' || range % 10 as kind, range / 2 as value "
+        f"from range({ROWS * 1000})) to '{path}'"
+    )
+
+
+def test_read_parquet(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "read_parquet"
+    path = tmp_path / "events.parquet"
+    _write_events(path)
+    engine = create_engine("duckdb:///:memory:")
+    events = read_parquet(str(path), {"id": Integer, "kind": String})
+    query = select(func.count(events.c.id)).where(events.c.kind == "kind 3")
+
+    with engine.connect() as conn:
+        count = benchmark(lambda: conn.execute(query).scalar())
+    assert count == ROWS * 100
+
+
+def test_read_parquet_duckdb(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    benchmark.group = "read_parquet"
+    path = tmp_path / "events.parquet"
+    _write_events(path)
+    conn = duckdb.connect()
+
+    count = benchmark(
+        lambda: conn.execute(
+            f"select count(id) from read_parquet('{path}') where kind = ?", ["kind 3"]
+        ).fetchone()
+    )
+    assert count == (ROWS * 100,)
@@ -5,7 +5,7 @@ from typing import Any, Dict, Type
 from uuid import uuid4
 
 from packaging.version import Version
-from pytest import importorskip, mark
+from pytest import MonkeyPatch, importorskip, mark, param
 from pytest_snapshot.plugin import Snapshot
 from sqlalchemy import (
     Column,
@@ -15,6 +15,8 @@ from sqlalchemy import (
     Sequence,
     String,
     Table,
+    cast,
+    column,
     inspect,
     schema,
     select,
@@ -27,8 +29,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.sql import sqltypes
 from sqlalchemy.types import FLOAT, JSON
 
+from .. import datatypes
 from .._supports import duckdb_version, has_uhugeint_support
-from ..datatypes import Map, Struct, types
+from ..datatypes import IS_GT_1, Map, Struct, Union, parse_type, types
+from .util import is_sqlalchemy_1
 
 
 @mark.parametrize("coltype", types)
@@ -178,12 +182,59 @@ def test_all_types_reflection(engine: Engine) -> None:
             name = col.name
             if name.endswith("_enum") and duckdb_version < Version("0.7.1"):
                 continue
-            if "array" in name or "struct" in name or "map" in name or "union" in name:
+            nested = (
+                "array" in name or "struct" in name or "map" in name or "union" in name
+            )
+            if nested and is_sqlalchemy_1:
+                # reflected through the emulated pg_catalog
                 assert col.type == sqltypes.NULLTYPE, name
             else:
                 assert col.type != sqltypes.NULLTYPE, name
         assert not capture
 
+    if not is_sqlalchemy_1:
+        struct = table.c.struct_of_arrays.type
+        assert isinstance(struct, Struct) and struct.fields
+        assert isinstance(struct.fields["a"], sqltypes.ARRAY)
+        assert isinstance(table.c.map.type, Map)
+        assert isinstance(table.c.union.type, Union)
+        assert table.c.nested_int_array.type.dimensions == 2  # type: ignore[attr-defined]
+        assert table.c.dec_18_6.type.scale == 6  # type: ignore[attr-defined]
+        assert table.c.timestamp_tz.type.timezone  # type: ignore[attr-defined]
+
+
+@mark.parametrize(
+    "data_type",
+    [
+        "INTEGER",
+        "DECIMAL(10,2)",
+        "TIMESTAMP WITH TIME ZONE",
+        param(
+            "VARCHAR[][3]",
+            marks=mark.skipif(
+                duckdb_version < Version("0.10.0"),
+                reason="fixed size arrays require at least duckdb 0.10.0",
+            ),
+        ),
+        'STRUCT(a INTEGER, "b ""c""" STRUCT(d VARCHAR)[])',
+        "MAP(VARCHAR, INTEGER[])",
+        "UNION(n INTEGER, s VARCHAR)",
+        "ENUM('a', 'it''s')",
+    ],
+)
+def test_parse_type(engine: Engine, data_type: str) -> None:
+    importorskip("duckdb", "0.5.0")
+    parsed = parse_type(data_type, engine.dialect.ischema_names)  # type: ignore[attr-defined]
+
+    with engine.connect() as conn:
+        conn.execute(text("create table t (x {})".format(data_type)))
+        [(round_tripped,)] = conn.execute(
+            text("select data_type from duckdb_columns() where table_name = 't'")
+        )
+
+    assert round_tripped == data_type
+    assert parsed != sqltypes.NULLTYPE
+
 
 def test_nested_types(engine: Engine, session: Session) -> None:
     importorskip("duckdb", "0.5.0")  # nested types require at least duckdb 0.5.0
@@ -248,3 +299,101 @@ def test_div_is_floordiv(engine: Engine) -> None:
     stmt = test_table.c.value / test_table.c.eur2usd_rate
 
     assert str(stmt.compile(engine)) == "test_table.value / test_table.eur2usd_rate"
+
+
+@mark.parametrize(
+    "make_type",
+    [
+        lambda string: Struct({"name": string, "inner": Struct({"val": Integer})}),
+        lambda string: Map(string, Integer),
+        lambda string: Union({"name": string, "age": Integer}),
+    ],
+    ids=["struct", "map", "union"],
+)
+def test_nested_type_cache_key(make_type: Any) -> None:
+    key = make_type(String)._static_cache_key
+
+    assert hash(key)
+    assert key == make_type(String())._static_cache_key
+    assert key != make_type(String(10))._static_cache_key
+
+    stmt_key = select(cast(column("x"), make_type(String)))._generate_cache_key()
+    assert (
+        stmt_key == select(cast(column("x"), make_type(String)))._generate_cache_key()
+    )
+
+
+def test_compiled_cache_reused(engine: Engine) -> None:
+    importorskip("sqlalchemy", "1.4.0")
+    base = declarative_base()
+
+    class Entry(base):
+        __tablename__ = "test_cache"
+
+        id = Column(Integer, primary_key=True, default=0)
+        struct = Column(Struct(fields={"name": String}))
+        map = Column(Map(String, Integer))
+
+    base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(
+            Entry.__table__.insert(),  # type: ignore[attr-defined]
+            {"id": 1, "struct": {"name": "Edgar"}, "map": {"one": 1}},
+        )
+
+        contexts = []
+        for i in (1, 2):
+            result = conn.execute(select(Entry.struct, Entry.map).where(Entry.id == i))
+            assert result.all() == ([({"name": "Edgar"}, {"one": 1})] if i == 1 else [])
+            contexts.append(result.context)
+
+        assert contexts[0].compiled is contexts[1].compiled
+        assert contexts[1].cache_hit == engine.dialect.CACHE_HIT
+
+
+def test_nested_result_processors(engine: Engine) -> None:
+    dialect = engine.dialect
+    struct = Struct({"name": String, "inner": Struct({"val": Integer})})
+    assert struct.result_processor(dialect, None) is None
+    if IS_GT_1:
+        # DuckDB already returns them as dicts
+        assert Map(String, Integer).result_processor(dialect, None) is None
+
+    entry = Table(
+        "nested_json",
+        MetaData(),
+        Column("struct", Struct({"doc": JSON, "name": String})),
+        Column("map", Map(String, JSON)),
+    )
+    with engine.begin() as conn:
+        entry.create(conn)
+        conn.execute(
+            text(
+                """insert into nested_json values """
+                """({'doc': '{"a": [1]}', 'name': 'x'}, map {'k': '{"b": 2}'}), """
+                """(null, null)"""
+            )
+        )
+        rows = conn.execute(select(entry.c.struct, entry.c.map)).fetchall()
+
+    assert rows[0] == ({"doc": {"a": [1]}, "name": "x"}, {"k": {"b": 2}})
+    # the older processor of maps turns NULL into an empty dict
+    assert rows[1] == (None, None if IS_GT_1 else {})
+
+
+def test_map_result_processor_key_value_lists(
+    engine: Engine, monkeypatch: MonkeyPatch
+) -> None:
+    # DuckDB 1.0 and earlier return maps as lists of keys and values
+    monkeypatch.setattr(datatypes, "IS_GT_1", False)
+
+    process = Map(String, Integer).result_processor(engine.dialect, None)
+    assert process is not None
+    assert process({"key": ["k"], "value": [1]}) == {"k": 1}
+    assert process(None) == {}
+
+    process = Map(String, JSON).result_processor(engine.dialect, None)
+    assert process is not None
+    assert process({"key": ["k"], "value": ['{"b": 2}']}) == {"k": {"b": 2}}
+    assert process(None) == {}
@@ -10,13 +10,15 @@ import random
 from collections import OrderedDict
 from datetime import datetime
 from itertools import product
-from typing import Dict, List, Optional, Tuple, Union, cast
+from typing import Callable, Dict, List, Optional, Tuple, Union, cast
 
 import pandas as pd
 from pandas.testing import assert_frame_equal
-from pytest import importorskip, mark
-from sqlalchemy import create_engine
+from pytest import importorskip, mark, raises
+from sqlalchemy import bindparam, column, create_engine, select, table, text
 
+from .. import insert_dataframe, read_sql
+from ..dataframes import VECTOR_SIZE
 from .util import sqlalchemy_1_only
 
 pytestmark = sqlalchemy_1_only
@@ -25,10 +27,7 @@ _possible_args = OrderedDict(
     {
         "chunksize": [None, 1, 10, 100],
         "if_exists": ["fail", "replace", "append"],
-        "method": [
-            None,
-            "multi",
-        ],  # TODO Implement a callable insert method?
+        "method": [None, "multi", insert_dataframe()],
     }
 )
 
@@ -69,21 +68,43 @@ sample_df: pd.DataFrame = pd.DataFrame(sample_data)
 def test_to_sql(
     chunksize: Optional[int],
     if_exists: str,
-    method: Optional[str],
+    method: Union[None, str, Callable],
     index: bool = False,
 ) -> None:
     eng = create_engine("duckdb:///:memory:")
-    try:
-        sample_df.to_sql(
-            name="foo",
-            con=eng,
-            if_exists=if_exists,
-            chunksize=chunksize,
-            index=index,
-        )
-    except ValueError as e:
-        if if_exists != "fail":
-            raise e
+    for _ in range(2):
+        try:
+            sample_df.to_sql(
+                name="foo",
+                con=eng,
+                if_exists=if_exists,
+                chunksize=chunksize,
+                index=index,
+                method=method,
+            )
+        except ValueError as e:
+            if if_exists != "fail":
+                raise e
+
+    expected = pd.concat([sample_df] * 2) if if_exists == "append" else sample_df
+    assert_frame_equal(
+        pd.read_sql("foo", eng), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_insert_dataframe_index() -> None:
+    eng = create_engine("duckdb:///:memory:")
+    df = pd.DataFrame(
+        {"value": [1.5, None, 3.0], "name": ["a", "b's", None]},
+        index=pd.Index([10, 20, 30], name="id"),
+    )
+
+    inserted = df.to_sql(
+        "frame", eng, index=True, chunksize=2, method=insert_dataframe()
+    )
+
+    assert inserted == 3
+    assert_frame_equal(pd.read_sql("frame", eng, index_col="id"), df)
 
 
 table_name = "test_read"
@@ -142,3 +163,51 @@ def test_read_sql_duckdb_table(tmp_path: pathlib.Path) -> None:
     assert_frame_equal(result, df)
     result = pd.read_sql("test_data", engine)
     assert_frame_equal(result, df)
+
+
+@mark.parametrize("chunksize", [None, 1, 30, 100, 5000])
+def test_read_sql_fetchdf(chunksize: Optional[int]) -> None:
+    eng = create_engine("duckdb:///:memory:")
+    sample_df.to_sql(name=table_name, con=eng, index=False)
+
+    result = read_sql(table_name, eng, chunksize=chunksize)
+    chunks = [result] if chunksize is None else list(result)
+
+    if chunksize is not None:
+        assert [len(chunk) for chunk in chunks[:-1]] == [chunksize] * (len(chunks) - 1)
+        assert 0 < len(chunks[-1]) <= chunksize
+    assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), sample_df, check_dtype=False
+    )
+
+
+def test_read_sql_fetchdf_query() -> None:
+    eng = create_engine("duckdb:///:memory:")
+    sample_df.to_sql(name=table_name, con=eng)
+
+    query = (
+        select(column("int"), column("str"))
+        .select_from(table(table_name))
+        .where(column("index") < bindparam("limit"))
+    )
+    with eng.connect() as conn:
+        frame = read_sql(query, conn, params={"limit": 10})
+        assert list(frame.columns) == ["int", "str"]
+        assert len(frame) == 10
+
+        frame = read_sql(
+            f"SELECT * FROM {table_name} WHERE index >= :low",
+            conn,
+            index_col="index",
+            params={"low": 95},
+        )
+        assert list(frame.index) == [95, 96, 97, 98, 99]
+
+        # running another statement mid iteration fails the iterator, rather
+        # than it returning rows of the wrong result
+        conn.execute(text("create table big as select * from range(5000)"))
+        chunks = read_sql("big", conn, chunksize=VECTOR_SIZE)
+        next(chunks)
+        assert conn.execute(text("select 1")).scalar() == 1
+        with raises(NotImplementedError):
+            next(chunks)
@@ -1,6 +1,10 @@
 from pyarrow import RecordBatch, RecordBatchReader
 from pyarrow import Table as ArrowTable
-from sqlalchemy import MetaData, Table, create_engine, text
+from pytest import raises
+from sqlalchemy import MetaData, Table, create_engine, literal_column, select, text
+from sqlalchemy.exc import InvalidRequestError
+
+from .. import fetch_arrow_table, fetch_record_batch
 
 
 def test_fetch_arrow() -> None:
@@ -44,3 +48,26 @@ def test_fetch_arrow() -> None:
         assert res.read_next_batch() == RecordBatch.from_pydict(
             {"label": ["zz"], "value": [6.0]}
         )
+
+
+def test_fetch_arrow_helpers() -> None:
+    engine = create_engine("duckdb:///:memory:")
+    stmt = select(literal_column("range").label("i")).select_from(text("range(5)"))
+    expected = ArrowTable.from_pydict({"i": list(range(5))})
+
+    with engine.connect() as con:
+        result = con.execute(stmt)
+        assert fetch_arrow_table(result) == expected
+        assert result.closed
+
+        reader = fetch_record_batch(con.execute(stmt), rows_per_batch=2)
+        assert reader.read_next_batch() == RecordBatch.from_pydict({"i": [0, 1]})
+
+        result = con.execute(stmt)
+        result.fetchone()
+        with raises(InvalidRequestError, match="already been fetched"):
+            fetch_arrow_table(result)
+
+        streamed = con.execution_options(stream_results=True).execute(stmt)
+        with raises(InvalidRequestError, match="stream_results"):
+            fetch_arrow_table(streamed)
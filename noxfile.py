@@ -55,12 +55,38 @@ def tests_core(session: nox.Session, duckdb: str, sqlalchemy: str) -> None:
             "--verbose",
             "-rs",
             "--remote-data",
+            # benchmarks run once, as tests, see the benchmarks session
+            "--benchmark-disable",
             env={
                 "SQLALCHEMY_WARN_20": "true",
             },
         )
 
 
+@nox.session(py=["3.9"], default=False)
+def benchmarks(session: nox.Session) -> None:
+    """
+    Benchmark the dialect against the same work done with duckdb alone
+
+    Each run is saved under .benchmarks and compared with the previous one,
+    extra arguments are passed to pytest, e.g.
+    ``nox -s benchmarks -- --benchmark-compare-fail=mean:10%``
+    """
+    with group(f"{session.name} - Install"):
+        poetry(session)
+    with group(f"{session.name} Run"):
+        session.run(
+            "pytest",
+            "duckdb_engine/tests/test_benchmarks.py",
+            "--benchmark-only",
+            "--benchmark-autosave",
+            "--benchmark-compare",
+            "--benchmark-group-by=group",
+            "--benchmark-columns=min,mean,stddev,rounds",
+            *session.posargs,
+        )
+
+
 def poetry(session: nox.Session) -> None:
     session.install("poetry")
     session.run("poetry", "install", "--with", "dev", "--verbose", silent=False)